@@ -5,3 +5,5 @@ Minimal, production-style conversational assistant on top of Elasticsearch knowl
 
 __version__ = "1.0.0"
 __author__ = "Sabi Team"
+
+from . import _paths  # noqa: F401
@@ -0,0 +1,16 @@
+"""
+Import paths for the project root and the txtai submodule, set up once per process
+"""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+TXTAI_PATH = PROJECT_ROOT / "txtai" / "src" / "python"
+
+# txtai submodule takes precedence over an installed txtai; the project root
+# makes `pipeline` importable as a package
+if str(TXTAI_PATH) not in sys.path:
+    sys.path.insert(0, str(TXTAI_PATH))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
@@ -2,17 +2,23 @@
 FastAPI server for Sabi Conversational Assistant
 """
 
+import asyncio
 import logging
 import os
+import sys
 import uvicorn
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
 
+import _paths  # noqa: F401  (sets up sys.path for pipeline and txtai imports)
+
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 # Create static directory if it doesn't exist
@@ -28,7 +34,33 @@ except Exception as e:
     logger.error(f"Traceback: {traceback.format_exc()}")
     router = None
 
-app = FastAPI(title="Sabi Conversational Assistant")
+# Worker threads for blocking LLM / Elasticsearch calls made via asyncio.to_thread
+THREAD_POOL_SIZE = 200
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Size the default executor so slow service calls don't starve other sessions"""
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE, thread_name_prefix="sabi")
+    loop.set_default_executor(executor)
+    
+    # Pre-load the embedding model so the first message doesn't pay for it
+    try:
+        from services.retriever_service import get_retriever_service
+        await asyncio.to_thread(get_retriever_service().warmup)
+    except Exception as e:
+        logger.error(f"Retriever warmup failed: {e}")
+    
+    yield
+    
+    try:
+        from services.retriever_service import get_retriever_service
+        await get_retriever_service().close()
+    except Exception as e:
+        logger.error(f"Retriever shutdown failed: {e}")
+    executor.shutdown(wait=False)
+
+app = FastAPI(title="Sabi Conversational Assistant", lifespan=lifespan)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
@@ -54,4 +86,27 @@ else:
 
 if __name__ == "__main__":
     logger.info("Starting server...")
-    uvicorn.run("main:app", host="localhost", port=8001, reload=True)
+    # uvloop has no Windows build; fall back to the stdlib asyncio loop there
+    loop = "uvloop" if sys.platform != "win32" else "asyncio"
+    # Auto-reload is a development convenience only
+    reload = os.environ.get("APP_ENV", "development") != "production"
+    # Reload mode can only run a single worker
+    from services.config import get_config
+    workers = 1 if reload else (get_config().get("websocket", {}).get("workers") or os.cpu_count())
+    # Local session history lives in one process; only Redis lets workers share it
+    if workers > 1 and get_config().get("chat", {}).get("memory_backend", "local") != "redis":
+        logger.warning("memory_backend is not redis; running a single worker so sessions keep their history")
+        workers = 1
+    uvicorn.run(
+        "main:app",
+        host="localhost",
+        port=8001,
+        loop=loop,
+        http="httptools",
+        ws="websockets",
+        # Chat frames are small; per-message deflate only costs zlib CPU
+        ws_per_message_deflate=False,
+        ws_max_size=1024 * 1024,
+        reload=reload,
+        workers=workers,
+    )
@@ -0,0 +1,74 @@
+"""
+Micro-batching scheduler that coalesces concurrent requests into one call
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """Collects items submitted within a short window and runs them as one batch"""
+
+    def __init__(self, fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 8, max_wait_ms: float = 10):
+        """
+        Args:
+            fn: Blocking batch function, called in a worker thread with a list of items
+            max_batch_size: Maximum number of items per batch
+            max_wait_ms: Maximum time to wait for a batch to fill up
+        """
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._running = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Submit a single item and wait for its result"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._collect())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        """Drain the queue into batches of up to max_batch_size items"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Run batches concurrently so a slow batch doesn't hold up the next window
+            task = asyncio.create_task(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        """Run one batch and distribute results back to the waiting futures"""
+        items = [item for item, _ in batch]
+        logger.debug("Running batch of %d items", len(items))
+
+        try:
+            results = await asyncio.to_thread(self.fn, items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
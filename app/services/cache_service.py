@@ -0,0 +1,161 @@
+"""
+Semantic Cache Service - reuse responses for near-duplicate queries
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    """
+    Cosine-similarity cache of LLM responses keyed on query embeddings.
+
+    Embeddings are L2-normalized on insert and live in one preallocated
+    matrix, so a lookup is a single matmul with no per-entry division. Above `lsh_min_entries` entries, random-projection
+    LSH buckets prune candidates before the dot product.
+
+    With `quantize` enabled, rows are stored as int8 with a per-row scale,
+    cutting cache memory 4x. Scores shift by well under 1%, which is small
+    next to the margin of a 0.95 similarity threshold.
+    """
+
+    def __init__(self):
+        self.config = get_config().get("cache", {})
+        self.enabled = self.config.get("enabled", True)
+        self.threshold = self.config.get("similarity_threshold", 0.95)
+        self.max_entries = self.config.get("max_entries", 1000)
+        self.ttl = self.config.get("ttl", 3600)
+        self.lsh_min_entries = self.config.get("lsh_min_entries", 10000)
+        self.lsh_bits = self.config.get("lsh_bits", 16)
+        self.quantize = self.config.get("quantize", False)
+
+        # Slot -> (history_key, response, created_at), ordered oldest to most recently used
+        self._entries: OrderedDict = OrderedDict()
+        self._free: List[int] = list(range(self.max_entries - 1, -1, -1))
+        self._matrix: Optional[np.ndarray] = None
+        self._scales = np.ones(self.max_entries, dtype=np.float32)
+        self._valid = np.zeros(self.max_entries, dtype=bool)
+        self._planes: Optional[np.ndarray] = None
+        self._codes = np.zeros(self.max_entries, dtype=np.int64)
+
+    @staticmethod
+    def history_key(history: List[Dict]) -> int:
+        """Fingerprint the conversation history a response depended on"""
+        return hash(tuple((msg["role"], msg["content"]) for msg in history))
+
+    def lookup(self, vector: np.ndarray, history_key: int) -> Optional[str]:
+        """Return a cached response for a similar query with the same history"""
+        if not self.enabled or not self._entries:
+            return None
+
+        query = self._normalize(vector)
+        if query is None:
+            return None
+
+        candidates = self._candidates(query)
+        if candidates.size == 0:
+            return None
+
+        scores = self._dot(candidates, query)
+        order = np.argsort(scores)[::-1]
+
+        now = time.monotonic()
+        for i in order:
+            if scores[i] < self.threshold:
+                break
+            slot = int(candidates[i])
+            key, response, created = self._entries[slot]
+            if now - created > self.ttl:
+                self._evict(slot)
+                continue
+            if key == history_key:
+                self._entries.move_to_end(slot)
+                return response
+
+        return None
+
+    def insert(self, vector: np.ndarray, history_key: int, response: str) -> None:
+        """Cache a response for a query embedding"""
+        if not self.enabled:
+            return
+
+        vector = self._normalize(vector)
+        if vector is None:
+            return
+        if self._matrix is None:
+            dtype = np.int8 if self.quantize else np.float32
+            self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=dtype)
+
+        if not self._free:
+            oldest = next(iter(self._entries))
+            self._evict(oldest)
+
+        slot = self._free.pop()
+        if self.quantize:
+            self._matrix[slot], self._scales[slot] = self._quantize(vector)
+        else:
+            self._matrix[slot] = vector
+        self._valid[slot] = True
+        self._codes[slot] = self._code(vector)
+        self._entries[slot] = (history_key, response, time.monotonic())
+
+    def _evict(self, slot: int) -> None:
+        """Release a cache slot"""
+        del self._entries[slot]
+        self._valid[slot] = False
+        self._free.append(slot)
+
+    def _dot(self, candidates: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Dot products of candidate rows with the query"""
+        if not self.quantize:
+            return self._matrix[candidates] @ query
+
+        # Integer dot products accumulate exactly in int32, then rescale once
+        qint, qscale = self._quantize(query)
+        raw = self._matrix[candidates].astype(np.int32) @ qint.astype(np.int32)
+        return raw * (self._scales[candidates] * qscale)
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> Optional[np.ndarray]:
+        """Unit-length float32 copy of a vector, None for a zero vector"""
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+    @staticmethod
+    def _quantize(vector: np.ndarray):
+        """Symmetric int8 quantization with a per-vector scale"""
+        scale = float(np.abs(vector).max()) / 127 or 1.0
+        return np.round(vector / scale).astype(np.int8), scale
+
+    def _candidates(self, query: np.ndarray) -> np.ndarray:
+        """Slots worth scoring; LSH-pruned once the cache is large"""
+        if len(self._entries) < self.lsh_min_entries:
+            return np.flatnonzero(self._valid)
+        return np.flatnonzero(self._valid & (self._codes == self._code(query)))
+
+    def _code(self, vector: np.ndarray) -> int:
+        """Random-projection LSH bucket for a vector"""
+        if self._planes is None:
+            rng = np.random.default_rng(0)
+            self._planes = rng.standard_normal((vector.shape[0], self.lsh_bits)).astype(np.float32)
+        bits = (vector @ self._planes) > 0
+        return int(bits @ (1 << np.arange(self.lsh_bits)))
+
+# Global instance
+_cache_service = None
+
+def get_cache_service() -> SemanticCache:
+    global _cache_service
+    if _cache_service is None:
+        _cache_service = SemanticCache()
+    return _cache_service
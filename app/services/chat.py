@@ -2,72 +2,187 @@
 Chat Service - Minimal WebSocket session handler
 """
 
+import asyncio
+import functools
 import logging
-from fastapi import WebSocket
+import time
+import uuid
+from collections import deque
+from typing import AsyncIterator, Dict
+from fastapi import WebSocket, WebSocketDisconnect
 
 from .llm_service import get_llm_service
 from .retriever_service import get_retriever_service
 from .memory_service import get_memory_service
 from .prompt_service import get_prompt_service
+from .cache_service import get_cache_service
+from .retrieval_router import get_retriever_router
+from .config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Coalesce streamed tokens into frames of at least this many chars, or flush after this many seconds
+FLUSH_CHARS = 32
+FLUSH_INTERVAL = 0.03
+
+class Outbox:
+    """
+    Per-connection queue of outbound frames, drained by a single writer task.
+
+    Once maxsize frames are waiting on a slow client, new chunks are merged
+    into the last queued chunk instead of growing the queue. Frames are
+    never dropped, because every chunk carries part of the reply text.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._frames: deque = deque()
+        self._ready = asyncio.Event()
+
+    def put(self, frame: Dict):
+        if len(self._frames) >= self.maxsize and frame["type"] == "chunk" and self._frames[-1]["type"] == "chunk":
+            self._frames[-1]["content"] += frame["content"]
+            return
+        self._frames.append(frame)
+        self._ready.set()
+
+    async def get(self) -> Dict:
+        while not self._frames:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._frames.popleft()
+
 class Chat:
     def __init__(self):
         self.llm_service = get_llm_service()
         self.retriever_service = get_retriever_service()
         self.memory_service = get_memory_service()
         self.prompt_service = get_prompt_service()
+        self.cache_service = get_cache_service()
+        self.router = get_retriever_router()
+        self.stream = get_config().get("chat", {}).get("stream", True)
+        self.outbox_size = get_config().get("chat", {}).get("outbox_size", 64)
 
     async def session(self, ws: WebSocket):
         """WebSocket session handler"""
         await ws.accept()
-        session_id = str(id(ws))
-        logger.info(f"Session started: {session_id}")
+        # A client-supplied id lets a reconnect on any worker resume the same history
+        session_id = ws.query_params.get("session_id") or uuid.uuid4().hex
+        logger.info("Session started: %s", session_id)
+
+        # Sends go through one writer task so a slow socket never stalls generation
+        outbox = Outbox(self.outbox_size)
+        writer = asyncio.create_task(self._writer(ws, outbox))
+        writer.add_done_callback(functools.partial(self._writer_done, ws, session_id))
 
         try:
-            while True:
-                message = await ws.receive_text()
-                response = await self.handle_message(session_id, message)
-                await ws.send_text(response)
-        except Exception as e:
-            logger.error(f"Session error: {e}")
-            # Don't try to close if already closed
+            async for message in ws.iter_text():
+                # A failed writer can't deliver replies; end the session instead of queueing more
+                if writer.done():
+                    break
+                await self.send_stream(outbox, self.handle_message(session_id, message))
+        except WebSocketDisconnect:
             pass
+        except Exception as e:
+            logger.error("Session error: %s", e)
+        finally:
+            writer.cancel()
+            self.memory_service.release(session_id)
+            logger.info("Session ended: %s", session_id)
 
-    async def handle_message(self, session_id: str, message: str) -> str:
-        """Process message using LLM, retriever, memory and prompt"""
+    @staticmethod
+    def _writer_done(ws: WebSocket, session_id: str, writer: asyncio.Task):
+        """Log a writer failure and close the socket so the receive loop ends"""
+        if writer.cancelled() or writer.exception() is None:
+            return
+        logger.error("Session %s send failed: %s", session_id, writer.exception())
+        closing = asyncio.ensure_future(ws.close())
+        # The socket is usually already broken; the close only needs to unblock iter_text
+        closing.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    @staticmethod
+    async def _writer(ws: WebSocket, outbox: Outbox):
+        """Drain the outbox onto the socket"""
+        while True:
+            await ws.send_json(await outbox.get())
+
+    async def send_stream(self, outbox: Outbox, chunks: AsyncIterator[str]):
+        """Queue response chunks as JSON frames, followed by an end frame"""
+        buffer = []
+        buffered = 0
+        last_flush = time.monotonic()
+
+        async for chunk in chunks:
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= FLUSH_CHARS or time.monotonic() - last_flush >= FLUSH_INTERVAL:
+                outbox.put({"type": "chunk", "content": "".join(buffer)})
+                buffer.clear()
+                buffered = 0
+                last_flush = time.monotonic()
+
+        if buffer:
+            outbox.put({"type": "chunk", "content": "".join(buffer)})
+        outbox.put({"type": "end"})
+
+    async def handle_message(self, session_id: str, message: str) -> AsyncIterator[str]:
+        """Process message using LLM, retriever, memory and prompt, yielding the response as it is generated"""
         try:
+            # Responses are only reusable for the same preceding conversation
+            history_key = self.cache_service.history_key(await self.memory_service.get_history(session_id))
+            
             # Store user message
-            self.memory_service.add_message(session_id, "user", message)
+            await self.memory_service.add_message(session_id, "user", message)
+            
+            # Answer near-duplicate queries from the semantic cache
+            query_embedding = await self.retriever_service.embed(message)
+            if query_embedding is not None:
+                cached = self.cache_service.lookup(query_embedding, history_key)
+                if cached is not None:
+                    logger.info("Semantic cache hit")
+                    await self.memory_service.add_message(session_id, "assistant", cached)
+                    yield cached
+                    return
             
             # Get context from retriever
-            context = ""
-            if self.retriever_service.is_available():
-                logger.info(f"Searching for: {message}")
-                results = self.retriever_service.search(message)
-                logger.info(f"Retriever results: {len(results)} items found")
+            context = []
+            if not self.router.should_retrieve(message, query_embedding):
+                logger.info("Skipping retrieval for small talk")
+            elif self.retriever_service.is_available():
+                logger.info("Searching for: %s", message)
+                results = await self.retriever_service.search(message, query_embedding=query_embedding)
+                logger.info("Retriever results: %d items found", len(results))
                 if results:
-                    context = "\n".join([r["text"] for r in results[:20]])
-                    logger.info(f"Context retrieved: {context[:100]}...")
+                    context = [r["text"] for r in results]
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Context retrieved: %s...", context[0][:100])
             else:
                 logger.warning("Retriever service not available")
             
             # Get conversation history
-            history = self.memory_service.get_history(session_id)
+            history = await self.memory_service.get_history(session_id)
             
             # Build prompt
             prompt = self.prompt_service.build_prompt(message, context, history)
-            logger.info(f"Final prompt length: {len(prompt)} chars")
+            logger.info("Final prompt: %d messages", len(prompt))
             
-            # Generate response
-            response = self.llm_service.generate(prompt)
+            # Generate response, streaming tokens to the client as they arrive
+            if self.stream:
+                tokens = []
+                async for token in self.llm_service.stream(prompt):
+                    tokens.append(token)
+                    yield token
+                response = "".join(tokens)
+            else:
+                response = await self.llm_service.generate(prompt)
+                yield response
             
             # Store assistant response
-            self.memory_service.add_message(session_id, "assistant", response)
-            
-            return response
+            await self.memory_service.add_message(session_id, "assistant", response)
+            # Generation failures raise before this point; only complete LLM replies are cached
+            if query_embedding is not None and self.llm_service.is_available():
+                self.cache_service.insert(query_embedding, history_key, response)
 
         except Exception as e:
-            logger.error(f"Error in handle_message: {e}")
-            return f"Error: {str(e)}"
+            logger.error("Error in handle_message: %s", e)
+            yield f"Error: {str(e)}"
@@ -0,0 +1,20 @@
+"""
+Shared application configuration, parsed once per process
+"""
+
+import os
+from functools import lru_cache
+from typing import Any, Dict
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+@lru_cache(maxsize=1)
+def get_config() -> Dict[str, Any]:
+    """Load the app config from the CONFIG path using the libyaml loader when available"""
+    with open(os.environ.get("CONFIG", "app/config/app.yml")) as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
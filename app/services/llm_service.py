@@ -2,17 +2,24 @@
 LLM Service using txtai LLM pipeline
 """
 
+import asyncio
 import logging
-import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, AsyncIterator, Union
+
+from .batcher import MicroBatcher
+from .config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Backends that generate a list of prompts in one call; litellm loops over them one at a time
+BATCHED_METHODS = ("llama.cpp", "transformers")
+
 class LLMService:
     """Service for LLM operations using txtai pipeline"""
     
     def __init__(self):
         self.llm_instance = None
+        self.batcher = None
         self._initialize_llm()
     
     def _initialize_llm(self):
@@ -21,23 +28,7 @@ class LLMService:
             # Import txtai LLM pipeline
             from txtai.pipeline.llm import LLM
             
-            # Load config from environment
-            config_path = os.environ.get("CONFIG")
-            if not config_path:
-                logger.warning("CONFIG environment variable not set")
-                return
-            
-            # Read config using existing Application
-            import sys
-            # Add txtai submodule path to Python path
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            txtai_path = os.path.join(project_root, 'txtai', 'src', 'python')
-            if txtai_path not in sys.path:
-                sys.path.insert(0, txtai_path)
-            from txtai.api.application import Application
-            
-            config = Application.read(config_path)
-            llm_config = config.get("llm", {})
+            llm_config = get_config().get("llm", {})
             
             if not llm_config:
                 logger.warning("No LLM configuration found")
@@ -48,22 +39,87 @@ class LLMService:
             method = llm_config.get("method", "litellm")
             temperature = llm_config.get("temperature", 0.7)
             
-            self.llm_instance = LLM(path=path, method=method, temperature=temperature)
+            self.llm_instance = LLM(path=path, method=method, temperature=temperature, **self._prefill_options(llm_config))
             logger.info(f"LLM initialized: {path}")
             
+            # Coalesce prompts from concurrent sessions into one pipeline call on local backends
+            if method in BATCHED_METHODS:
+                batching = llm_config.get("batching", {})
+                self.batcher = MicroBatcher(
+                    self._generate_batch,
+                    max_batch_size=batching.get("max_batch_size", 8),
+                    max_wait_ms=batching.get("max_wait_ms", 10)
+                )
+            
         except Exception as e:
             logger.error(f"Failed to initialize LLM: {e}")
     
-    def generate(self, query: str, **kwargs) -> str:
-        """Generate response using LLM"""
+    @staticmethod
+    def _prefill_options(llm_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Backend options that split long prompt prefill into chunks"""
+        if not llm_config.get("chunked_prefill", False):
+            return {}
+        
+        method = llm_config.get("method", "litellm")
+        chunk_tokens = llm_config.get("prefill_chunk_tokens", 512)
+        if method == "llama.cpp":
+            # llama.cpp evaluates the prompt n_batch tokens at a time
+            return {"n_batch": chunk_tokens}
+        
+        # Remote backends schedule prefill server-side, e.g. vLLM's --enable-chunked-prefill
+        logger.info(f"chunked_prefill has no effect for the {method} backend; configure it on the serving side")
+        return {}
+    
+    async def generate(self, query: Union[str, List[Dict]], **kwargs) -> str:
+        """Generate response using LLM without blocking the event loop, raising if generation fails"""
         if not self.llm_instance:
             return "LLM service not available"
         
         try:
-            return self.llm_instance(query, defaultrole="user", **kwargs)
+            # Per-call generation options can't be shared across a batch
+            if self.batcher is None or kwargs:
+                return await asyncio.to_thread(self.llm_instance, query, defaultrole="user", **kwargs)
+            return await self.batcher.submit(query)
         except Exception as e:
             logger.error(f"LLM generation failed: {e}")
-            return f"Error: {str(e)}"
+            raise
+    
+    async def stream(self, query: Union[str, List[Dict]], **kwargs) -> AsyncIterator[str]:
+        """Stream response tokens as the LLM produces them, raising if generation fails partway"""
+        if not self.llm_instance:
+            yield "LLM service not available"
+            return
+        
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        
+        def produce():
+            # Runs in a worker thread; hands tokens back to the event loop
+            try:
+                for token in self.llm_instance(query, defaultrole="user", stream=True, **kwargs):
+                    loop.call_soon_threadsafe(queue.put_nowait, token)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+        
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                token = await queue.get()
+                if token is done:
+                    break
+                if isinstance(token, Exception):
+                    logger.error(f"LLM streaming failed: {token}")
+                    raise token
+                yield token
+        finally:
+            await producer
+    
+    def _generate_batch(self, queries: List[Union[str, List[Dict]]]) -> List[str]:
+        """Generate responses for a batch of prompts in one pipeline call"""
+        return self.llm_instance(queries, defaultrole="user")
     
     def is_available(self) -> bool:
         """Check if LLM is available"""
@@ -2,35 +2,114 @@
 Minimal Memory Service for chat context
 """
 
-import os
-import yaml
-from typing import List, Dict
+import json
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Iterable
+
+from .config import get_config
+from .tokenizer import count_tokens
+
+logger = logging.getLogger(__name__)
 
 class MemoryService:
     def __init__(self):
-        self.config = self._load_config()
+        self.config = get_config()
         self.max_items = self.config.get("chat", {}).get("max_memory_items", 5)
-        self.sessions: Dict[str, List[Dict]] = {}
+        self.session_timeout = self.config.get("chat", {}).get("session_timeout", 3600)
+        # Ordered by last use, so expired sessions collect at the front
+        self.sessions: "OrderedDict[str, Deque[Dict]]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+    
+    async def add_message(self, session_id: str, role: str, content: str):
+        # Token count is computed once here and reused by every later prompt
+        self._append(session_id, {"role": role, "content": content, "tokens": count_tokens(content)})
+    
+    async def get_history(self, session_id: str) -> Iterable[Dict]:
+        self._expire()
+        if session_id not in self.sessions:
+            return ()
+        self._touch(session_id)
+        return self.sessions[session_id]
     
-    def _load_config(self):
-        with open(os.environ.get("CONFIG", "app/config/app.yml")) as f:
-            return yaml.safe_load(f)
+    def release(self, session_id: str):
+        """Called when a session's WebSocket closes; local history is kept for reconnects until session_timeout"""
     
-    def add_message(self, session_id: str, role: str, content: str):
+    def _append(self, session_id: str, message: Dict):
+        self._expire()
         if session_id not in self.sessions:
-            self.sessions[session_id] = []
+            # Bounded deque drops the oldest message once max_items is reached
+            self.sessions[session_id] = deque(maxlen=self.max_items)
+        
+        self.sessions[session_id].append(message)
+        self._touch(session_id)
+    
+    def _touch(self, session_id: str):
+        self._last_used[session_id] = time.monotonic()
+        self.sessions.move_to_end(session_id)
+    
+    def _drop(self, session_id: str):
+        self.sessions.pop(session_id, None)
+        self._last_used.pop(session_id, None)
+    
+    def _expire(self):
+        """Drop sessions idle for longer than session_timeout"""
+        cutoff = time.monotonic() - self.session_timeout
+        while self.sessions:
+            oldest = next(iter(self.sessions))
+            if self._last_used[oldest] > cutoff:
+                break
+            self._drop(oldest)
+
+class RedisMemoryService(MemoryService):
+    """
+    Session history shared across uvicorn workers through Redis.
+
+    Each session is a Redis list trimmed to max_items. The per-process deques
+    act as an L1 cache for sessions with an open WebSocket on this worker, so
+    only the first read of a session goes to Redis.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        import redis.asyncio as redis
         
-        self.sessions[session_id].append({
-            "role": role,
-            "content": content
-        })
+        chat_config = self.config.get("chat", {})
+        self.ttl = self.session_timeout
+        self.redis = redis.from_url(chat_config.get("redis_url", "redis://localhost:6379/0"))
+    
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"sabi:session:{session_id}"
+    
+    async def add_message(self, session_id: str, role: str, content: str):
+        message = {"role": role, "content": content, "tokens": count_tokens(content)}
+        key = self._key(session_id)
+        
+        # Append, trim and refresh the expiry in one round-trip
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, json.dumps(message))
+            pipe.ltrim(key, -self.max_items, -1)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
         
-        # Keep only recent messages
-        if len(self.sessions[session_id]) > self.max_items:
-            self.sessions[session_id] = self.sessions[session_id][-self.max_items:]
+        # Expire first so a stale L1 copy isn't revived holding only this message
+        self._expire()
+        if session_id in self.sessions:
+            self._append(session_id, message)
+    
+    async def get_history(self, session_id: str) -> Iterable[Dict]:
+        self._expire()
+        if session_id not in self.sessions:
+            stored = await self.redis.lrange(self._key(session_id), -self.max_items, -1)
+            self.sessions[session_id] = deque((json.loads(item) for item in stored), maxlen=self.max_items)
+        self._touch(session_id)
+        return self.sessions[session_id]
     
-    def get_history(self, session_id: str) -> List[Dict]:
-        return self.sessions.get(session_id, [])
+    def release(self, session_id: str):
+        # History lives on in Redis; drop the L1 copy
+        self._drop(session_id)
 
 # Global instance
 _memory_service = None
@@ -38,5 +117,7 @@ _memory_service = None
 def get_memory_service() -> MemoryService:
     global _memory_service
     if _memory_service is None:
-        _memory_service = MemoryService()
+        backend = get_config().get("chat", {}).get("memory_backend", "local")
+        _memory_service = RedisMemoryService() if backend == "redis" else MemoryService()
+        logger.info(f"Memory backend: {backend}")
     return _memory_service
@@ -2,43 +2,62 @@
 Minimal Prompt Service for system prompts
 """
 
-import os
-import yaml
 import logging
+from typing import Dict, List
+
+from .config import get_config
+from .tokenizer import count_tokens
 
 logger = logging.getLogger(__name__)
 
 class PromptService:
     def __init__(self):
-        self.config = self._load_config()
+        self.config = get_config()
         self.system_prompt = self.config.get(
             "system_prompt",
             "You are Sabi. You are Logi’s personal companion. Act like a human girl, not an AI."
         )
-    
-    def _load_config(self):
-        with open(os.environ.get("CONFIG", "app/config/app.yml")) as f:
-            return yaml.safe_load(f)
+        chat_config = self.config.get("chat", {})
+        # Bound prefill cost: history gets up to history_tokens, retrieved context fills the rest
+        self.max_prompt_tokens = chat_config.get("max_prompt_tokens", 2048)
+        self.history_tokens = chat_config.get("history_tokens", 512)
+        self.system_tokens = count_tokens(self.system_prompt)
     
     def get_system_prompt(self) -> str:
         return self.system_prompt
     
-    def build_prompt(self, user_query: str, context: str = "", history: list = None) -> str:
-        prompt_parts = [self.system_prompt]
+    def build_prompt(self, user_query: str, context: List[str] = None, history: list = None) -> List[Dict]:
+        """Build chat-format messages within the max_prompt_tokens budget"""
+        messages = [{"role": "system", "content": self.system_prompt}]
+        budget = self.max_prompt_tokens - self.system_tokens - count_tokens(user_query)
 
-        # Conversation history (natural dialogue)
-        if history:
-            for msg in history[-3:]:
-                prompt_parts.append(f"{msg['role']}: {msg['content']}")
+        # Conversation history (natural dialogue), newest turns first until the history budget runs out
+        turns = []
+        history_budget = min(self.history_tokens, budget)
+        for msg in reversed(history or ()):
+            tokens = msg.get("tokens") or count_tokens(msg["content"])
+            if tokens > history_budget:
+                break
+            history_budget -= tokens
+            budget -= tokens
+            turns.append({"role": msg["role"], "content": msg["content"]})
+        messages.extend(reversed(turns))
 
-        # Inject retrieved knowledge silently (no labels)
-        if context:
-            prompt_parts.append(context)
+        # Inject retrieved knowledge silently (no labels), best-ranked passages first
+        passages = []
+        for passage in context or ():
+            tokens = count_tokens(passage)
+            if tokens > budget:
+                break
+            budget -= tokens
+            passages.append(passage)
+        if passages:
+            messages.append({"role": "system", "content": "\n".join(passages)})
 
         # User message (last, raw)
-        prompt_parts.append(f"user: {user_query}")
+        messages.append({"role": "user", "content": user_query})
 
-        return "\n".join(prompt_parts)
+        return messages
 
 
 # Global instance
@@ -0,0 +1,91 @@
+"""
+Retrieval Router - decide whether a message needs knowledge-base context
+"""
+
+import json
+import logging
+import re
+from typing import List, Optional
+
+import numpy as np
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+# Greetings, acknowledgements and filler that never need retrieved context
+SMALL_TALK = frozenset({
+    "hi", "hello", "hey", "hii", "yo", "sup", "morning", "evening", "night", "good", "bye", "goodbye",
+    "thanks", "thank", "thx", "ty", "ok", "okay", "k", "cool", "nice", "great", "lol", "haha", "hmm",
+    "yes", "yeah", "yep", "no", "nope", "sure", "welcome", "sorry", "love", "miss"
+})
+
+STOPWORDS = frozenset({
+    "a", "an", "the", "i", "me", "my", "you", "your", "we", "it", "is", "am", "are", "was", "be", "so",
+    "to", "of", "and", "or", "in", "on", "at", "for", "with", "too", "very", "just", "oh", "ah", "how",
+    "what", "up", "there", "much", "all", "again", "see", "u", "ur"
+})
+
+_WORD = re.compile(r"[a-z']+")
+
+class RetrieverRouter:
+    """
+    Cheap gate in front of retrieval.
+
+    Short messages made up almost entirely of small talk and stopwords skip
+    retrieval. If a logistic-regression model trained offline on query
+    embeddings is configured, it decides for everything else.
+    """
+
+    def __init__(self):
+        self.config = get_config().get("retriever", {}).get("router", {})
+        self.enabled = self.config.get("enabled", True)
+        self.max_words = self.config.get("max_words", 4)
+        self.stopword_ratio = self.config.get("stopword_ratio", 0.75)
+        self.threshold = self.config.get("threshold", 0.5)
+        self.weights: Optional[np.ndarray] = None
+        self.bias = 0.0
+        self._load_model(self.config.get("model_path"))
+
+    def _load_model(self, path: Optional[str]):
+        """Load logistic-regression weights: {"weights": [...], "bias": float}"""
+        if not path:
+            return
+        try:
+            with open(path) as f:
+                model = json.load(f)
+            self.weights = np.asarray(model["weights"], dtype=np.float32)
+            self.bias = float(model.get("bias", 0.0))
+            logger.info(f"Retrieval router model loaded: {len(self.weights)} weights")
+        except Exception as e:
+            logger.error(f"Failed to load retrieval router model: {e}")
+
+    def should_retrieve(self, message: str, embedding: Optional[List[float]] = None) -> bool:
+        """Return False for chit-chat that retrieval can't help with"""
+        if not self.enabled:
+            return True
+
+        words = _WORD.findall(message.lower())
+        if not words:
+            return False
+
+        if len(words) <= self.max_words:
+            filler = sum(1 for word in words if word in SMALL_TALK or word in STOPWORDS)
+            if filler / len(words) >= self.stopword_ratio:
+                return False
+
+        if self.weights is not None and embedding is not None:
+            # Model outputs the probability that the message is small talk
+            logit = float(np.dot(self.weights, np.asarray(embedding, dtype=np.float32))) + self.bias
+            return 1 / (1 + np.exp(-logit)) < self.threshold
+
+        return True
+
+# Global instance
+_retriever_router = None
+
+def get_retriever_router() -> RetrieverRouter:
+    global _retriever_router
+    if _retriever_router is None:
+        _retriever_router = RetrieverRouter()
+    return _retriever_router
@@ -2,10 +2,14 @@
 Retriever Service using existing Elasticsearch connectors
 """
 
+import asyncio
 import logging
-import os
-import sys
-from typing import List, Dict, Any
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+from .batcher import MicroBatcher
+from .config import get_config
 
 logger = logging.getLogger(__name__)
 
@@ -14,51 +18,45 @@ class RetrieverService:
     
     def __init__(self):
         self.es_connector = None
-        self.config = self._load_config()
+        self.local_index = None
+        self._local_index_checked = 0.0
+        self._local_index_task: Optional[asyncio.Task] = None
+        self.config = get_config()
+        self.index_name = self.config.get("elasticsearch", {}).get("index_name", "healthai_vectors")
+        # Must match the loader's embeddings.vector_precision; byte indices need int8 query vectors
+        self.vector_precision = self.config.get("elasticsearch", {}).get("vector_precision", "float32")
         self._initialize_connector()
+        self._initialize_local_index()
         self._embedding_service = None
-    
-    def _load_config(self):
-        """Load configuration"""
-        import os
-        import yaml
-        config_path = os.environ.get("CONFIG", "app/config/app.yml")
-        with open(config_path) as f:
-            return yaml.safe_load(f)
+        # Exact-match cache of normalized query text -> embedding
+        self._query_vectors: OrderedDict = OrderedDict()
+        self._query_cache_size = self.config.get("cache", {}).get("embedding_cache_size", 1024)
+        # Coalesce concurrent query encodings into one forward pass
+        batching = self.config.get("retriever", {}).get("batching", {})
+        self._embedding_batcher = MicroBatcher(
+            self._embed_batch,
+            max_batch_size=batching.get("max_batch_size", 16),
+            max_wait_ms=batching.get("max_wait_ms", 5)
+        )
+        # Request bodies built once; each search only swaps in the query and size
+        self._knn_template = {
+            "knn": {
+                "field": "vector",  # Field containing the document embeddings (corrected from 'embedding' to 'vector')
+                "query_vector": None,
+                "k": 20,
+                "num_candidates": 100  # Number of candidates to consider
+            },
+            "_source": ["text", "metadata"]  # Fields to return
+        }
+        self._keyword_template = {"query": {"match": {"text": None}}, "size": 20}
     
     def _initialize_connector(self):
         """Initialize Elasticsearch connector from existing pipeline"""
         try:
             # Import existing connector
-            import sys
-            # Add pipeline paths relative to project root
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            pipeline_path = os.path.join(project_root, 'pipeline')
-            connectors_path = os.path.join(pipeline_path, 'connectors')
-            
-            if connectors_path not in sys.path:
-                sys.path.insert(0, connectors_path)
-            if pipeline_path not in sys.path:
-                sys.path.insert(0, pipeline_path)
-                
-            from elasticsearch import ElasticsearchConnector
-            
-            # Load config
-            config_path = os.environ.get("CONFIG")
-            if not config_path:
-                logger.warning("CONFIG environment variable not set")
-                return
-            
-            import sys
-            # Add txtai submodule path to Python path
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            txtai_path = os.path.join(project_root, 'txtai', 'src', 'python')
-            if txtai_path not in sys.path:
-                sys.path.insert(0, txtai_path)
-            from txtai.api.application import Application
+            from pipeline.connectors.elasticsearch import ElasticsearchConnector
             
-            config = Application.read(config_path)
-            es_config = config.get("elasticsearch", {})
+            es_config = self.config.get("elasticsearch", {})
             
             if not es_config:
                 logger.warning("No Elasticsearch configuration found")
@@ -72,16 +70,55 @@ class RetrieverService:
         except Exception as e:
             logger.error(f"Failed to initialize Elasticsearch connector: {e}")
     
+    def _initialize_local_index(self):
+        """Load or build the in-process vector index when enabled"""
+        index_config = self.config.get("retriever", {}).get("local_index", {})
+        if not index_config.get("enabled", False) or not self.es_connector:
+            return
+        
+        try:
+            from .vector_index import LocalVectorIndex
+            
+            local_index = LocalVectorIndex(index_config)
+            if not local_index.load():
+                local_index.build(self.es_connector, self.index_name)
+            
+            # A persisted copy counts as checked when it was written, so an old one refreshes soon
+            self._local_index_checked = time.monotonic() - min(local_index.age(), time.monotonic())
+            self.local_index = local_index
+        except Exception as e:
+            logger.error(f"Failed to initialize local vector index: {e}")
+    
+    def _refresh_local_index(self) -> None:
+        """Start a background rebuild once the local index is older than refresh_interval"""
+        interval = self.config.get("retriever", {}).get("local_index", {}).get("refresh_interval", 600)
+        if not interval or time.monotonic() - self._local_index_checked < interval:
+            return
+        if self._local_index_task is not None and not self._local_index_task.done():
+            return
+        
+        # Searches keep using the current index until the rebuilt one is swapped in
+        self._local_index_checked = time.monotonic()
+        self._local_index_task = asyncio.create_task(asyncio.to_thread(self._rebuild_local_index, interval))
+    
+    def _rebuild_local_index(self, max_age: float) -> None:
+        """Rebuild the local index from Elasticsearch and swap it in"""
+        try:
+            from .vector_index import LocalVectorIndex
+            
+            local_index = LocalVectorIndex(self.config.get("retriever", {}).get("local_index", {}))
+            local_index.refresh(self.es_connector, self.index_name, max_age)
+            self.local_index = local_index
+            logger.info("Local vector index refreshed")
+        except Exception as e:
+            logger.error(f"Failed to refresh local vector index: {e}")
+    
     def _get_embedding_service(self):
         """Get or create embedding service using txtai's EmbeddingAligner"""
         if self._embedding_service is None:
             try:
                 # Import EmbeddingAligner from pipeline
-                project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                pipeline_path = os.path.join(project_root, 'pipeline')
-                if pipeline_path not in sys.path:
-                    sys.path.insert(0, pipeline_path)
-                from loaders.embeddings import EmbeddingAligner
+                from pipeline.loaders.embeddings import EmbeddingAligner
                 
                 # Get embeddings config
                 embeddings_config = self.config.get("embeddings", {})
@@ -102,85 +139,118 @@ class RetrieverService:
         
         return self._embedding_service
     
-    def search(self, query: str, index: str = None, size: int = 20) -> List[Dict[str, Any]]:
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Encode a batch of queries in one call"""
+        return self._get_embedding_service().generate_vectors(texts)
+    
+    def warmup(self) -> None:
+        """Load the embedding model ahead of the first request"""
+        try:
+            self._embed_batch(["warmup"])
+            logger.info("Embedding model warmed up")
+        except Exception as e:
+            logger.error(f"Embedding warmup failed: {e}")
+    
+    async def embed(self, query: str) -> Optional[List[float]]:
+        """Embed a query, reusing the vector for repeated queries"""
+        key = " ".join(query.lower().split())
+        vector = self._query_vectors.get(key)
+        if vector is not None:
+            self._query_vectors.move_to_end(key)
+            return vector
+        
+        try:
+            vector = await self._embedding_batcher.submit(query)
+        except Exception as e:
+            logger.error("Query embedding failed: %s", e)
+            return None
+        
+        self._query_vectors[key] = vector
+        if len(self._query_vectors) > self._query_cache_size:
+            self._query_vectors.popitem(last=False)
+        return vector
+    
+    async def search(self, query: str, index: str = None, size: int = 20,
+                     query_embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
         """Search documents in Elasticsearch using vector similarity"""
         if not self.es_connector:
             logger.error("Elasticsearch connector not available")
             return []
         
+        # Use default index if not provided
+        if not index:
+            index = self.index_name
+        
         try:
-            # Use default index if not provided
-            if not index:
-                index = self.config.get("elasticsearch", {}).get("index_name", "healthai_vectors")
+            if query_embedding is None:
+                query_embedding = await self.embed(query)
+            if query_embedding is None:
+                raise ValueError("Query embedding not available")
             
-            # Get the embedding for the query using txtai's EmbeddingAligner
-            embedding_service = self._get_embedding_service()
-            vectors = embedding_service.generate_vectors([query])
-            query_embedding = vectors[0]
-            logger.info(f"Generated embedding vector of dimension: {len(query_embedding)}")
+            # Serve from the in-process index when it mirrors the requested index
+            if self.local_index and index == self.index_name:
+                self._refresh_local_index()
+                return await asyncio.to_thread(self.local_index.search, query_embedding, size)
             
             # Build KNN search query
+            query_vector = query_embedding
+            if self.vector_precision == "int8":
+                from pipeline.loaders.embeddings import quantize_int8
+                query_vector = quantize_int8(query_embedding)[0].tolist()
             search_body = {
-                "knn": {
-                    "field": "vector",  # Field containing the document embeddings (corrected from 'embedding' to 'vector')
-                    "query_vector": query_embedding,
-                    "k": size,
-                    "num_candidates": 100  # Number of candidates to consider
-                },
-                "_source": ["text", "metadata"]  # Fields to return
+                **self._knn_template,
+                "knn": {**self._knn_template["knn"], "query_vector": query_vector, "k": size}
             }
-            logger.info(f"Executing KNN search with vector dimension {len(query_embedding)}")
+            logger.debug("Executing KNN search with vector dimension %d", len(query_embedding))
             
             # Execute search
-            response = self.es_connector.search(index, search_body)
-            logger.info(f"KNN search executed successfully, found {len(response.get('hits', {}).get('hits', []))} results")
-            
-            # Format results
-            results = []
-            for hit in response.get('hits', {}).get('hits', []):
-                source = hit.get('_source', {})
-                results.append({
-                    'chunk_id': hit.get('_id'),
-                    'text': source.get('text', ''),
-                    'metadata': source.get('metadata', {}),
-                    'score': hit.get('_score')
-                })
+            response = await self._execute(index, search_body)
+            results = self._format_hits(response)
+            logger.info("KNN search executed successfully, found %d results", len(results))
             
             return results
             
         except Exception as e:
-            logger.error(f"Vector search failed: {e}")
+            logger.error("Vector search failed: %s", e)
             # Fall back to keyword search if vector search fails
             logger.info("Falling back to keyword search")
-            return self._keyword_search(query, index, size)
+            return await self._keyword_search(query, index, size)
     
-    def _keyword_search(self, query: str, index: str, size: int) -> List[Dict[str, Any]]:
+    async def _keyword_search(self, query: str, index: str, size: int) -> List[Dict[str, Any]]:
         """Fallback keyword-based search"""
         try:
-            search_body = {
-                "query": {
-                    "match": {
-                        "text": query
-                    }
-                },
-                "size": size
-            }
-            response = self.es_connector.search(index, search_body)
-            
-            results = []
-            for hit in response.get('hits', {}).get('hits', []):
-                source = hit.get('_source', {})
-                results.append({
-                    'chunk_id': hit.get('_id'),
-                    'text': source.get('text', ''),
-                    'metadata': source.get('metadata', {}),
-                    'score': hit.get('_score')
-                })
-            return results
+            search_body = {**self._keyword_template, "query": {"match": {"text": query}}, "size": size}
+            response = await self._execute(index, search_body)
+            return self._format_hits(response)
         except Exception as e:
-            logger.error(f"Keyword search also failed: {e}")
+            logger.error("Keyword search also failed: %s", e)
             return []
     
+    async def _execute(self, index: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a search on the async client, or the sync client in a worker thread"""
+        if self.es_connector.is_async:
+            return await self.es_connector.asearch(index, body)
+        return await asyncio.to_thread(self.es_connector.search, index, body)
+    
+    @staticmethod
+    def _format_hits(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Flatten Elasticsearch hits into result dicts"""
+        results = []
+        for hit in response.get('hits', {}).get('hits', []):
+            source = hit.get('_source', {})
+            results.append({
+                'chunk_id': hit.get('_id'),
+                'text': source.get('text', ''),
+                'metadata': source.get('metadata', {}),
+                'score': hit.get('_score')
+            })
+        return results
+    
+    async def close(self) -> None:
+        """Release Elasticsearch connections"""
+        if self.es_connector:
+            await self.es_connector.adisconnect()
+    
     def is_available(self) -> bool:
         """Check if the retriever service is available"""
         return self.es_connector is not None and self.es_connector.test_connection()
@@ -0,0 +1,28 @@
+"""
+Token counting for prompt budgeting
+"""
+
+import logging
+from functools import lru_cache
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """tiktoken encoding named by chat.tokenizer, or None to fall back to a chars/4 estimate"""
+    name = get_config().get("chat", {}).get("tokenizer", "cl100k_base")
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning(f"Tokenizer '{name}' unavailable, estimating tokens from length: {e}")
+        return None
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in text"""
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode_ordinary(text))
@@ -0,0 +1,147 @@
+"""
+Local Vector Index - in-process FAISS HNSW copy of the Elasticsearch vectors
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import faiss
+import numpy as np
+from filelock import FileLock
+
+logger = logging.getLogger(__name__)
+
+class LocalVectorIndex:
+    """
+    FAISS HNSW index over the documents stored in Elasticsearch.
+
+    Built once from an Elasticsearch scan and persisted to disk, so vector
+    search runs in-process without a network round-trip. Vectors are stored
+    L2-normalized, so the inner product is cosine similarity. Builds, saves
+    and loads hold a file lock, so worker processes never read a half-written
+    index or an index paired with another build's documents.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.path = config.get("path", "data/index/healthai_vectors.faiss")
+        self.docs_path = f"{self.path}.docs.json"
+        self.m = config.get("m", 32)
+        self.ef_construction = config.get("ef_construction", 200)
+        self.ef_search = config.get("ef_search", 64)
+        self.index = None
+        self.docs: List[Dict[str, Any]] = []
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Reentrant within this instance, so build() can call save() while holding it
+        self._lock = FileLock(f"{self.path}.lock")
+
+    def load(self) -> bool:
+        """Load a persisted index, returns False if none exists"""
+        with self._lock:
+            return self._load()
+
+    def _load(self) -> bool:
+        if not (os.path.exists(self.path) and os.path.exists(self.docs_path)):
+            return False
+
+        self.index = faiss.read_index(self.path)
+        if self.index.metric_type != faiss.METRIC_INNER_PRODUCT:
+            # Persisted by an older L2 build; rebuild with normalized vectors
+            return False
+        self.index.hnsw.efSearch = self.ef_search
+        with open(self.docs_path) as f:
+            self.docs = json.load(f)
+
+        logger.info(f"Loaded local vector index with {len(self.docs)} documents")
+        return True
+
+    def build(self, es_connector, index_name: str) -> None:
+        """Build the index from every document in an Elasticsearch index"""
+        with self._lock:
+            self._build(es_connector, index_name)
+
+    def _build(self, es_connector, index_name: str) -> None:
+        vectors, docs = [], []
+        query = {"query": {"exists": {"field": "vector"}}, "_source": ["text", "metadata", "vector"]}
+        for hit in es_connector.scan(index_name, query):
+            source = hit.get("_source", {})
+            vectors.append(source["vector"])
+            docs.append({
+                "chunk_id": hit.get("_id"),
+                "text": source.get("text", ""),
+                "metadata": source.get("metadata", {})
+            })
+
+        if not vectors:
+            raise ValueError(f"No vectors found in index '{index_name}'")
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        faiss.normalize_L2(matrix)
+        self.index = faiss.IndexHNSWFlat(matrix.shape[1], self.m, faiss.METRIC_INNER_PRODUCT)
+        self.index.hnsw.efConstruction = self.ef_construction
+        self.index.hnsw.efSearch = self.ef_search
+        self.index.add(matrix)
+        self.docs = docs
+
+        self.save()
+        logger.info(f"Built local vector index with {len(docs)} documents")
+
+    def refresh(self, es_connector, index_name: str, max_age: float) -> None:
+        """Rebuild from Elasticsearch, or load another process's build younger than max_age"""
+        with self._lock:
+            if self.age() < max_age and self._load():
+                return
+            self._build(es_connector, index_name)
+
+    def age(self) -> float:
+        """Seconds since the persisted index was written, infinite if there is none"""
+        try:
+            return time.time() - os.path.getmtime(self.path)
+        except OSError:
+            return float("inf")
+
+    def save(self) -> None:
+        """Persist the index and its documents, swapping each file in atomically"""
+        with self._lock:
+            index_tmp = self._temp_path(self.path)
+            docs_tmp = self._temp_path(self.docs_path)
+            try:
+                faiss.write_index(self.index, index_tmp)
+                with open(docs_tmp, "w") as f:
+                    json.dump(self.docs, f)
+                os.replace(docs_tmp, self.docs_path)
+                os.replace(index_tmp, self.path)
+            finally:
+                # Left behind only if a write failed
+                for tmp_path in (index_tmp, docs_tmp):
+                    if os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
+
+    @staticmethod
+    def _temp_path(path: str) -> str:
+        """Fresh temp file next to its destination, so os.replace stays on one filesystem"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+        os.close(fd)
+        return tmp_path
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def search(self, vector, size: int) -> List[Dict[str, Any]]:
+        """Return the nearest documents to a query vector"""
+        query = np.array(vector, dtype=np.float32)[None, :]
+        faiss.normalize_L2(query)
+        scores, ids = self.index.search(query, size)
+
+        results = []
+        for score, i in zip(scores[0], ids[0]):
+            if i < 0:
+                continue
+            results.append({
+                **self.docs[i],
+                "score": float(score)
+            })
+        return results
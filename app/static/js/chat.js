@@ -7,7 +7,13 @@ document.addEventListener('DOMContentLoaded', () => {
     // Determine WebSocket URL
     const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
     const host = window.location.host;
-    const wsUrl = `${protocol}//${host}/ws/chat`;
+    // Stable session id so a reconnect resumes the same conversation on any worker
+    let sessionId = localStorage.getItem('sabi-session-id');
+    if (!sessionId) {
+        sessionId = crypto.randomUUID();
+        localStorage.setItem('sabi-session-id', sessionId);
+    }
+    const wsUrl = `${protocol}//${host}/ws/chat?session_id=${encodeURIComponent(sessionId)}`;
     
     // Create WebSocket connection
     const socket = new WebSocket(wsUrl);
@@ -20,15 +26,31 @@ document.addEventListener('DOMContentLoaded', () => {
         sendButton.disabled = false;
     });
 
-    // Listen for messages
+    // Assistant message currently being streamed
+    let streamingMessage = null;
+    let streamingText = '';
+
+    // Listen for messages: {"type": "chunk", "content": ...} frames followed by {"type": "end"}
     socket.addEventListener('message', (event) => {
+        const frame = JSON.parse(event.data);
+
+        if (frame.type === 'end') {
+            streamingMessage = null;
+            streamingText = '';
+            return;
+        }
+
         // Remove typing indicator if present
         const typingIndicator = document.querySelector('.typing-indicator');
         if (typingIndicator) {
             typingIndicator.remove();
         }
         
-        addMessage('assistant', event.data);
+        if (!streamingMessage) {
+            streamingMessage = addMessage('assistant', '');
+        }
+        streamingText += frame.content;
+        streamingMessage.querySelector('.message-content').innerHTML = formatMessage(streamingText);
         scrollToBottom();
     });
 
@@ -106,6 +128,7 @@ document.addEventListener('DOMContentLoaded', () => {
         messageDiv.className = `message ${role}`;
         messageDiv.innerHTML = `<div class="message-content">${formatMessage(content)}</div>`;
         chatMessages.appendChild(messageDiv);
+        return messageDiv;
     }
 
     function formatMessage(text) {
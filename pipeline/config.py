@@ -0,0 +1,68 @@
+"""Shared YAML config loading for pipeline components."""
+
+import json
+import os
+import tempfile
+from typing import Any, Dict, Tuple
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# (absolute path, mtime_ns) -> parsed config, shared by every manager in the process
+_CONFIG_CACHE: Dict[Tuple[str, int], Dict[str, Any]] = {}
+
+
+def load_yaml(path: str) -> Dict[str, Any]:
+    """Load a YAML config file, reusing a JSON copy while the YAML is unchanged.
+    
+    Parsed configs are memoized per process until the file changes, and
+    cached next to the source as ``<path>.cache.json`` across processes.
+    Callers share the returned dict and must not mutate it.
+    
+    Args:
+        path: Path to the YAML file
+        
+    Returns:
+        Parsed configuration (empty dict for an empty file)
+        
+    Raises:
+        FileNotFoundError: If the YAML file does not exist
+    """
+    source_stat = os.stat(path)
+    key = (os.path.abspath(path), source_stat.st_mtime_ns)
+    if key not in _CONFIG_CACHE:
+        _CONFIG_CACHE[key] = _load_cached(path, source_stat.st_mtime)
+    return _CONFIG_CACHE[key]
+
+
+def _load_cached(path: str, source_mtime: float) -> Dict[str, Any]:
+    """Read the JSON copy of a YAML file if fresh, otherwise parse and rewrite it."""
+    cache_path = path + '.cache.json'
+    try:
+        if source_mtime <= os.stat(cache_path).st_mtime:
+            with open(cache_path, 'r') as file:
+                return json.load(file)
+    except (OSError, ValueError):
+        pass
+    
+    with open(path, 'r') as file:
+        config = yaml.load(file, Loader=_YamlLoader) or {}
+    
+    # Write atomically so a concurrent reader never sees a partial cache
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or '.', suffix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            json.dump(config, file)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # Read-only location or values JSON can't represent: just skip the cache
+        try:
+            os.unlink(tmp_path)
+        except (OSError, NameError):
+            pass
+    
+    return config
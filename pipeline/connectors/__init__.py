@@ -5,14 +5,26 @@ This module provides a unified interface for connecting to different services
 including PostgreSQL, Elasticsearch, and Gmail through a factory pattern.
 """
 
+from importlib import import_module
+
 from .base import BaseConnector
-from .postgres import PostgresConnector
-from .elasticsearch import ElasticsearchConnector
-from .gmail import GmailConnector
 from .factory import ConnectorFactory
-from .registry import *  # Register all connectors
+from .registry import *  # Connector classes register themselves when first loaded
 from .manager import ConnectorManager
 
+# Client libraries (psycopg2, elasticsearch, google-api) load only when their connector is used
+_LAZY = {
+    'PostgresConnector': '.postgres',
+    'ElasticsearchConnector': '.elasticsearch',
+    'GmailConnector': '.gmail',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     'BaseConnector',
     'PostgresConnector',
@@ -1,9 +1,16 @@
-from elasticsearch import Elasticsearch
+from elasticsearch import AsyncElasticsearch, Elasticsearch
 import os
-from typing import Any, Dict, Optional, List
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional, List, Tuple
 from .base import BaseConnector
 from .registry import ConnectorRegistry
 
+try:
+    # orjson-backed serializer (also serializes numpy arrays natively)
+    from elasticsearch.serializer import OrjsonSerializer
+except ImportError:
+    OrjsonSerializer = None
+
 
 class ElasticsearchConnector(BaseConnector):
     """Elasticsearch connector using YAML configuration."""
@@ -11,7 +18,16 @@ class ElasticsearchConnector(BaseConnector):
     def __init__(self, name: str, config: Dict[str, Any]):
         super().__init__(name, config)
         self._client = None
+        self._async_client = None
         self._connection_info = {}
+        # (monotonic timestamp, healthy) of the last cluster health probe
+        self._last_health = (0.0, False)
+        self._health_ttl = self.config.get('connection', {}).get('health_ttl', 5.0)
+    
+    @property
+    def is_async(self) -> bool:
+        """Whether an AsyncElasticsearch client is available for asearch()."""
+        return self._async_client is not None
     
     def connect(self) -> None:
         """Establish Elasticsearch connection using YAML configuration."""
@@ -34,6 +50,10 @@ class ElasticsearchConnector(BaseConnector):
             # Remove None values
             conn_params = {k: v for k, v in conn_params.items() if v is not None}
             
+            # Request bodies carry full embedding vectors; orjson encodes them several times faster than stdlib json
+            if OrjsonSerializer is not None and 'serializer' not in conn_params:
+                conn_params['serializer'] = OrjsonSerializer()
+            
             # Create client with version compatibility
             try:
                 self._client = Elasticsearch(**conn_params)
@@ -45,6 +65,10 @@ class ElasticsearchConnector(BaseConnector):
                     conn_params.pop('verify_certs')
                 self._client = Elasticsearch(**conn_params)
             
+            # Non-blocking client for callers running on an event loop; shares the same pool settings
+            if self.config.get('connection', {}).get('use_async', False):
+                self._async_client = AsyncElasticsearch(**conn_params)
+            
             # Test connection and store info
             info = self._client.info()
             self._connection_info = {
@@ -63,20 +87,36 @@ class ElasticsearchConnector(BaseConnector):
                 self._client.close()
                 self._client = None
                 self._connection_info = {}
+                self._last_health = (0.0, False)
         except Exception as e:
             raise ConnectionError(f"Error disconnecting from Elasticsearch: {e}")
     
+    async def adisconnect(self) -> None:
+        """Close the async client, then the sync one."""
+        if self._async_client:
+            await self._async_client.close()
+            self._async_client = None
+        self.disconnect()
+    
     def test_connection(self) -> bool:
-        """Test Elasticsearch connection."""
+        """Test Elasticsearch connection, reusing the last probe for health_ttl seconds."""
+        if not self._client:
+            return False
+        
+        checked, healthy = self._last_health
+        now = time.monotonic()
+        if now - checked < self._health_ttl:
+            return healthy
+        
         try:
-            if not self._client:
-                return False
-            
             # Simple cluster health check
             health = self._client.cluster.health()
-            return health.get('status') in ['green', 'yellow']
+            healthy = health.get('status') in ['green', 'yellow']
         except Exception:
-            return False
+            healthy = False
+        
+        self._last_health = (now, healthy)
+        return healthy
     
     def get_connection_info(self) -> Dict[str, Any]:
         """Get Elasticsearch connection information."""
@@ -111,6 +151,39 @@ class ElasticsearchConnector(BaseConnector):
         except Exception as e:
             raise e
     
+    async def asearch(self, index: str, query: Dict[str, Any]) -> Dict[str, Any]:
+        """Search documents without blocking the event loop."""
+        if not self._async_client:
+            raise ConnectionError("Async Elasticsearch client not enabled")
+        
+        return await self._async_client.search(
+            index=index,
+            body=query,
+        )
+    
+    def scan(self, index: str, query: Dict[str, Any] = None, size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Stream every matching hit using the scroll API.
+        
+        Args:
+            index: Index name
+            query: Query body (defaults to match_all)
+            size: Number of hits fetched per scroll page
+            
+        Returns:
+            Iterator of raw hits
+        """
+        if not self._client:
+            raise ConnectionError("Not connected to Elasticsearch")
+        
+        from elasticsearch.helpers import scan
+        yield from scan(
+            self._client,
+            index=index,
+            query=query or {"query": {"match_all": {}}},
+            size=size,
+            preserve_order=False
+        )
+    
     def index_document(self, index: str, doc_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
         """Index a document in Elasticsearch."""
         if not self._client:
@@ -202,6 +275,33 @@ class ElasticsearchConnector(BaseConnector):
         """Bulk operations in Elasticsearch (alias for bulk_index)."""
         return self.bulk_index(actions)
     
+    def parallel_bulk(self, actions: Iterable[Dict[str, Any]], thread_count: int = 4,
+                      chunk_size: int = 500, queue_size: int = 4) -> Iterator[Tuple[bool, Dict[str, Any]]]:
+        """Bulk index from a thread pool, sending chunks concurrently.
+        
+        Args:
+            actions: Bulk actions, consumed lazily
+            thread_count: Concurrent bulk requests
+            chunk_size: Actions per bulk request
+            queue_size: Chunks buffered ahead of the threads
+            
+        Returns:
+            Iterator of (ok, item) per action; failed items are reported, not raised
+        """
+        if not self._client:
+            raise ConnectionError("Not connected to Elasticsearch")
+        
+        from elasticsearch.helpers import parallel_bulk
+        yield from parallel_bulk(
+            self._client,
+            actions,
+            thread_count=thread_count,
+            chunk_size=chunk_size,
+            queue_size=queue_size,
+            raise_on_error=False,
+            raise_on_exception=False
+        )
+    
     def count(self, index: str = None, body: Dict[str, Any] = None) -> int:
         """Count documents in an index.
         
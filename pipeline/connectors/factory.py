@@ -23,5 +23,7 @@ class ConnectorFactory:
         Raises:
             ValueError: If connector type is not registered.
         """
-        connector_class = ConnectorRegistry.get(connector_type)
+        connector_class = ConnectorRegistry.lookup(connector_type)
+        if connector_class is None:
+            raise ValueError(f"Connector type '{connector_type}' not registered")
         return connector_class(name=name, config=config)
\ No newline at end of file
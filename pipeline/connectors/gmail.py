@@ -1,12 +1,19 @@
+import json
 import os
-import pickle
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build, Resource
 from .base import BaseConnector
 from .registry import ConnectorRegistry
 
+# Gmail accepts at most 100 calls in one batch HTTP request
+MAX_BATCH_REQUESTS = 100
+
+# token_path -> (token file mtime_ns, credentials loaded from it)
+_token_cache: Dict[str, Tuple[int, Credentials]] = {}
+
 
 class GmailConnector(BaseConnector):
     """Gmail API connector for fetching emails and attachments."""
@@ -36,11 +43,18 @@ class GmailConnector(BaseConnector):
 
     def connect(self) -> None:
         """Authenticate and build Gmail service client."""
-        creds = None
+        creds = self._cached_credentials()
+        if creds is not None:
+            self.service = build("gmail", self.api_version, credentials=creds)
+            return
 
         if os.path.exists(self.token_path):
-            with open(self.token_path, "rb") as token:
-                creds = pickle.load(token)
+            try:
+                with open(self.token_path, "r") as token:
+                    creds = Credentials.from_authorized_user_info(json.load(token), self.scopes)
+            except ValueError:
+                # Unreadable token (e.g. one pickled by an older version): authorize again
+                creds = None
 
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
@@ -51,11 +65,24 @@ class GmailConnector(BaseConnector):
                 )
                 creds = flow.run_local_server(port=self.auth_port)
 
-            with open(self.token_path, "wb") as token:
-                pickle.dump(creds, token)
+            with open(self.token_path, "w") as token:
+                token.write(creds.to_json())
 
+        _token_cache[self.token_path] = (os.stat(self.token_path).st_mtime_ns, creds)
         self.service = build("gmail", self.api_version, credentials=creds)
 
+    def _cached_credentials(self) -> Optional[Credentials]:
+        """Credentials loaded earlier in this process, if the token file is unchanged and still valid."""
+        cached = _token_cache.get(self.token_path)
+        if cached is None:
+            return None
+        try:
+            mtime = os.stat(self.token_path).st_mtime_ns
+        except OSError:
+            return None
+        mtime_ns, creds = cached
+        return creds if mtime_ns == mtime and creds.valid else None
+
     def disconnect(self) -> None:
         self.service = None
 
@@ -104,6 +131,61 @@ class GmailConnector(BaseConnector):
         ).execute()
         return message
 
+    def get_messages_batch(self, message_ids: list) -> list:
+        """Get full Gmail messages by ID, one HTTP round-trip per 100 messages.
+
+        Returns:
+            Messages in the same order as message_ids
+        """
+        if not self.service:
+            raise Exception("Not connected to Gmail service")
+
+        messages = self.service.users().messages()
+        requests = [messages.get(userId="me", id=message_id, format="full") for message_id in message_ids]
+
+        results = []
+        for response, exception in self._execute_batch(requests):
+            if exception is not None:
+                raise exception
+            results.append(response)
+        return results
+
+    def get_attachments_batch(self, attachment_refs: list) -> list:
+        """Get Gmail attachments for (message_id, attachment_id) pairs, one HTTP round-trip per 100.
+
+        Returns:
+            Attachments in the same order as attachment_refs; a failed fetch is
+            returned as its exception so one bad attachment doesn't fail the rest
+        """
+        if not self.service:
+            raise Exception("Not connected to Gmail service")
+
+        attachments = self.service.users().messages().attachments()
+        requests = [
+            attachments.get(userId="me", messageId=message_id, id=attachment_id)
+            for message_id, attachment_id in attachment_refs
+        ]
+        return [exception or response for response, exception in self._execute_batch(requests)]
+
+    def _execute_batch(self, requests: list) -> list:
+        """Execute API requests as batch HTTP requests.
+
+        Returns:
+            (response, exception) tuples in the same order as requests
+        """
+        results = [None] * len(requests)
+
+        def collect(request_id, response, exception):
+            results[int(request_id)] = (response, exception)
+
+        for start in range(0, len(requests), MAX_BATCH_REQUESTS):
+            batch = self.service.new_batch_http_request(callback=collect)
+            for i, request in enumerate(requests[start:start + MAX_BATCH_REQUESTS], start):
+                batch.add(request, request_id=str(i))
+            batch.execute()
+
+        return results
+
     def get_attachment(self, message_id: str, attachment_id: str):
         """Get Gmail attachment by ID."""
         if not self.service:
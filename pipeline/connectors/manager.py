@@ -1,10 +1,11 @@
 """Manager class for handling multiple connectors."""
 
 import os
-import yaml
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
 from .base import BaseConnector
 from .factory import ConnectorFactory
+from ..config import load_yaml
 
 
 class ConnectorManager:
@@ -21,14 +22,15 @@ class ConnectorManager:
         
         self.config_path = config_path
         self._connectors: Dict[str, BaseConnector] = {}
+        # Names of connectors this manager has connected
+        self._connected: set[str] = set()
         self._config: Optional[Dict[str, Any]] = None
     
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
         if self._config is None:
             try:
-                with open(self.config_path, 'r') as file:
-                    self._config = yaml.safe_load(file) or {}
+                self._config = load_yaml(self.config_path)
             except FileNotFoundError:
                 self._config = {}
             except Exception as e:
@@ -42,6 +44,14 @@ class ConnectorManager:
             self._connectors[name] = self._create_connector(name)
         return self._connectors[name]
     
+    def connect(self, name: str) -> BaseConnector:
+        """Get a connector by name, connecting it on first use."""
+        connector = self.get_connector(name)
+        if name not in self._connected:
+            connector.connect()
+            self._connected.add(name)
+        return connector
+    
     def _create_connector(self, name: str) -> BaseConnector:
         """Create a connector from configuration."""
         config = self.load_config()
@@ -64,19 +74,63 @@ class ConnectorManager:
         return list(config.get('connectors', {}).keys())
     
     def connect_all(self) -> None:
-        """Connect all configured connectors."""
-        for name in self.list_connectors():
-            connector = self.get_connector(name)
-            if not connector.is_connected():
-                connector.connect()
+        """Connect all configured connectors concurrently.
+        
+        Connection setup is network-bound (OAuth refresh, TCP/TLS handshakes),
+        so connecting in parallel costs the slowest connector rather than the sum.
+        
+        Raises:
+            ConnectionError: If any connector failed to connect
+        """
+        pending = [self.get_connector(name) for name in self.list_connectors() if name not in self._connected]
+        
+        errors = self._run_concurrently(pending, lambda connector: connector.connect())
+        self._connected.update(connector.name for connector in pending if connector.name not in errors)
+        if errors:
+            details = '; '.join(f"{name}: {error}" for name, error in errors.items())
+            raise ConnectionError(f"Failed to connect: {details}")
     
     def disconnect_all(self) -> None:
         """Disconnect all connectors."""
-        for connector in self._connectors.values():
-            try:
-                if connector.is_connected():
-                    connector.disconnect()
-            except Exception:
-                pass
+        connected = [self._connectors[name] for name in self._connected]
+        self._run_concurrently(connected, lambda connector: connector.disconnect())
         
+        self._connected.clear()
         self._connectors.clear()
+    
+    @staticmethod
+    def _run_concurrently(connectors: List[BaseConnector],
+                          action: Callable[[BaseConnector], None]) -> Dict[str, Exception]:
+        """Run an action on each connector in a thread pool.
+        
+        Returns:
+            Exceptions raised, keyed by connector name
+        """
+        errors: Dict[str, Exception] = {}
+        if not connectors:
+            return errors
+        
+        with ThreadPoolExecutor(max_workers=min(len(connectors), 8)) as executor:
+            futures = {executor.submit(action, connector): connector.name for connector in connectors}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    errors[futures[future]] = e
+        
+        return errors
+
+
+_default_cm: Optional[ConnectorManager] = None
+
+
+def get_connector_manager() -> ConnectorManager:
+    """Get the process-wide ConnectorManager for the default config.
+    
+    Sharing one manager means each connector is created, and connected,
+    at most once per process.
+    """
+    global _default_cm
+    if _default_cm is None:
+        _default_cm = ConnectorManager()
+    return _default_cm
@@ -1,7 +1,12 @@
 import psycopg2
+import csv
+import io
 import os
+import tempfile
+from uuid import uuid4
 from psycopg2 import sql
-from typing import Any, Dict, Optional
+from psycopg2.extras import RealDictCursor, execute_values
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 from .base import BaseConnector
 from .registry import ConnectorRegistry
 
@@ -36,7 +41,8 @@ class PostgresConnector(BaseConnector):
             conn_params.update(connection_params)
             
             self._connection = psycopg2.connect(**conn_params)
-            self._cursor = self._connection.cursor()
+            # Rows come back as dicts built on the C side
+            self._cursor = self._connection.cursor(cursor_factory=RealDictCursor)
             
         except Exception as e:
             raise ConnectionError(f"Failed to connect to PostgreSQL: {e}")
@@ -57,24 +63,151 @@ class PostgresConnector(BaseConnector):
         """Return the live database connection."""
         return self._connection
     
-    def execute_query(self, query: str, params: Optional[tuple] = None) -> list:
-        """Execute a query and return results."""
+    def execute_query(self, query: Union[str, sql.Composable], params: Optional[tuple] = None, *,
+                      stream: bool = False, arraysize: int = 2000) -> Union[list, Iterator[Dict[str, Any]]]:
+        """Execute a query and return results.
+        
+        Args:
+            query: SQL query, plain or composed with psycopg2.sql
+            params: Query parameters
+            stream: Return an iterator backed by a server-side cursor instead of a list,
+                so only `arraysize` rows are held in memory at a time
+            arraysize: Rows fetched per round-trip when streaming
+        """
         if not self._connection or not self._cursor:
             raise ConnectionError("Not connected to PostgreSQL")
         
+        if stream:
+            return self._stream_query(query, params, arraysize)
+        
         try:
             self._cursor.execute(query, params)
             if self._cursor.description:
-                # Get column names from cursor description
-                columns = [desc[0] for desc in self._cursor.description]
-                rows = self._cursor.fetchall()
-                # Convert to list of dictionaries
-                return [dict(zip(columns, row)) for row in rows]
+                return self._cursor.fetchall()
             self._connection.commit()
             return []
         except Exception as e:
             self._connection.rollback()
             raise e
+    
+    def execute_values(self, query: str, rows: Iterable[tuple], page_size: int = 1000) -> int:
+        """Bulk insert rows with one multi-row VALUES statement per page.
+        
+        Args:
+            query: INSERT statement with a single `VALUES %s` placeholder
+            rows: Row tuples to insert
+            page_size: Rows sent per statement
+            
+        Returns:
+            Number of rows inserted
+        """
+        if not self._connection or not self._cursor:
+            raise ConnectionError("Not connected to PostgreSQL")
+        
+        count = 0
+        
+        def counted(rows):
+            nonlocal count
+            for row in rows:
+                count += 1
+                yield row
+        
+        try:
+            execute_values(self._cursor, query, counted(rows), page_size=page_size)
+            self._connection.commit()
+            return count
+        except Exception as e:
+            self._connection.rollback()
+            raise e
+    
+    def copy_from(self, table: str, rows: Iterable[tuple], columns: List[str]) -> int:
+        """Bulk load rows with COPY FROM STDIN, skipping per-row statement parsing.
+        
+        Args:
+            table: Target table, optionally schema-qualified (`schema.table`)
+            rows: Row tuples in `columns` order; None and empty strings load as NULL
+            columns: Target column names
+            
+        Returns:
+            Number of rows copied
+        """
+        if not self._connection or not self._cursor:
+            raise ConnectionError("Not connected to PostgreSQL")
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        buffer.seek(0)
+        
+        statement = sql.SQL("COPY {} ({}) FROM STDIN WITH CSV").format(
+            sql.Identifier(*table.split('.')),
+            sql.SQL(', ').join(map(sql.Identifier, columns))
+        )
+        
+        try:
+            self._cursor.copy_expert(statement, buffer)
+            self._connection.commit()
+            return count
+        except Exception as e:
+            self._connection.rollback()
+            raise e
+    
+    def copy_query(self, query: Union[str, sql.Composable],
+                   spool_size: int = 64 * 1024 * 1024) -> Iterator[Dict[str, Optional[str]]]:
+        """Stream the result of a SELECT through COPY TO STDOUT.
+        
+        COPY skips per-row protocol framing and per-value type conversion, so
+        every value comes back as text (None for NULL), keyed by column name.
+        
+        Args:
+            query: SELECT statement, plain or composed with psycopg2.sql
+            spool_size: Bytes of CSV held in memory before spilling to a temp file
+        """
+        if not self._connection or not self._cursor:
+            raise ConnectionError("Not connected to PostgreSQL")
+        
+        if not isinstance(query, sql.Composable):
+            query = sql.SQL(query)
+        statement = sql.SQL("COPY ({}) TO STDOUT WITH (FORMAT csv, HEADER true, NULL '\\N')").format(query)
+        with tempfile.SpooledTemporaryFile(max_size=spool_size, mode='w+', newline='') as buffer:
+            try:
+                self._cursor.copy_expert(statement, buffer)
+                self._connection.commit()
+            except Exception as e:
+                self._connection.rollback()
+                raise e
+            
+            buffer.seek(0)
+            reader = csv.reader(buffer)
+            columns = next(reader, None)
+            if columns is None:
+                return
+            for row in reader:
+                yield {column: None if value == '\\N' else value for column, value in zip(columns, row)}
+    
+    def _stream_query(self, query: Union[str, sql.Composable], params: Optional[tuple], arraysize: int) -> Iterator[Dict[str, Any]]:
+        """Yield rows from a named (server-side) cursor, one page at a time."""
+        # Outside a transaction (autocommit) a named cursor must be declared WITH HOLD
+        cursor = self._connection.cursor(name=f"pg_stream_{uuid4().hex}", cursor_factory=RealDictCursor,
+                                         withhold=self._connection.autocommit)
+        cursor.itersize = arraysize
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(arraysize)
+                if not rows:
+                    break
+                yield from rows
+            cursor.close()
+            # A named cursor lives inside a transaction; end it
+            self._connection.commit()
+        except BaseException:
+            cursor.close()
+            self._connection.rollback()
+            raise
 
 
 # Register the connector
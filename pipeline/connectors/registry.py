@@ -1,6 +1,7 @@
 """Connector registration module."""
 
-from typing import Dict, Type
+from importlib import import_module
+from typing import Dict, Optional, Type
 from .base import BaseConnector
 
 
@@ -9,19 +10,37 @@ class ConnectorRegistry:
     
     _connectors: Dict[str, Type[BaseConnector]] = {}
     
+    # Built-in connector modules, imported the first time their type is requested
+    _modules: Dict[str, str] = {
+        'postgres': '.postgres',
+        'elasticsearch': '.elasticsearch',
+        'gmail': '.gmail',
+    }
+    
     @classmethod
     def register(cls, connector_type: str, connector_class: Type[BaseConnector]) -> None:
         """Register a connector class."""
         cls._connectors[connector_type] = connector_class
     
+    @classmethod
+    def lookup(cls, connector_type: str) -> Optional[Type[BaseConnector]]:
+        """Get a connector class by type, or None if it isn't registered."""
+        connector_class = cls._connectors.get(connector_type)
+        if connector_class is None and connector_type in cls._modules:
+            # Importing the module registers the connector
+            import_module(cls._modules[connector_type], __package__)
+            connector_class = cls._connectors.get(connector_type)
+        return connector_class
+    
     @classmethod
     def get(cls, connector_type: str) -> Type[BaseConnector]:
         """Get a connector class by type."""
-        if connector_type not in cls._connectors:
+        connector_class = cls.lookup(connector_type)
+        if connector_class is None:
             raise ValueError(f"Connector type '{connector_type}' not registered")
-        return cls._connectors[connector_type]
+        return connector_class
     
     @classmethod
     def list_connectors(cls) -> list[str]:
-        """List all registered connector types."""
-        return list(cls._connectors.keys())
+        """List all registered and built-in connector types."""
+        return list(dict.fromkeys([*cls._connectors, *cls._modules]))
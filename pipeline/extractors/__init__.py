@@ -1,7 +1,19 @@
+from importlib import import_module
+
 from .base import BaseExtractor
-from .gmail import GmailExtractor
-from .postgres import PostgresExtractor
-from .elasticsearch import ElasticsearchExtractor
 from .factory import ExtractorFactory
-from .manager import ExtractorManager
-from .registry import ExtractorRegistry
\ No newline at end of file
+from .registry import ExtractorRegistry
+
+# Heavy extractors and the manager (which pulls in every connector client) load on first access
+_LAZY = {
+    "GmailExtractor": ".gmail",
+    "PostgresExtractor": ".postgres",
+    "ElasticsearchExtractor": ".elasticsearch",
+    "ExtractorManager": ".manager",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
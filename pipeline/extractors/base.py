@@ -1,6 +1,11 @@
 # pipeline/extractors/base.py
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Queue
+from threading import Event
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+_DONE = object()
 
 
 class BaseExtractor(ABC):
@@ -12,3 +17,56 @@ class BaseExtractor(ABC):
     @abstractmethod
     def extract(self) -> Iterator[Dict[str, Any]]:
         pass
+
+
+def interleave(sources: List[Callable[[], Iterable[Any]]], max_workers: int,
+               queue_size: int = 1000) -> Iterator[Any]:
+    """Drain several independent sources on a thread pool, yielding items as they arrive.
+    
+    Args:
+        sources: Zero-argument callables, each returning an iterable; run one per thread
+        max_workers: Maximum concurrent sources
+        queue_size: Items buffered ahead of the consumer
+    
+    The first exception raised by a source is re-raised here once the
+    other sources have stopped.
+    """
+    # Bounded so fast sources can't outrun the consumer
+    items: Queue = Queue(maxsize=queue_size)
+    stop = Event()
+    errors = []
+    
+    def drain(source: Callable[[], Iterable[Any]]) -> None:
+        try:
+            for item in source():
+                if stop.is_set():
+                    return
+                items.put(item)
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            items.put(_DONE)
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sources)))) as pool:
+        futures = [pool.submit(drain, source) for source in sources]
+        
+        try:
+            remaining = len(sources)
+            while remaining and not errors:
+                item = items.get()
+                if item is _DONE:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            # Consumer stopped early or a source failed; unblock producers waiting on a full queue
+            stop.set()
+            while not all(future.done() for future in futures):
+                try:
+                    items.get(timeout=0.1)
+                except Empty:
+                    pass
+    
+    if errors:
+        raise errors[0]
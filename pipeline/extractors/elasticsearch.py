@@ -1,8 +1,12 @@
 # pipeline/extractors/elasticsearch.py
+import logging
+from functools import partial
 from typing import Iterator, Dict, Any
-from .base import BaseExtractor
+from .base import BaseExtractor, interleave
 from .registry import ExtractorRegistry
 
+logger = logging.getLogger(__name__)
+
 
 class ElasticsearchExtractor(BaseExtractor):
     def __init__(self, name: str, connector, config: Dict[str, Any]):
@@ -14,31 +18,45 @@ class ElasticsearchExtractor(BaseExtractor):
         extraction_mode = self.config.get('extraction_mode', 'full')
         date_field = self.config.get('date_field', '@timestamp')
         batch_size = self.config.get('batch_size', 1000)
+        max_workers = self.config.get('max_workers', 4)
+        
+        # Build query based on extraction mode
+        query = {"query": {"match_all": {}}}
+        
+        if extraction_mode == 'incremental_date' and date_field:
+            # For now, just extract all data - state management would be added here
+            pass
+        
+        if len(indices) > 1 and max_workers > 1:
+            # Scan indices concurrently, yielding documents as they arrive
+            yield from interleave(
+                [partial(self._scan_index, index, query, batch_size) for index in indices],
+                max_workers,
+                queue_size=batch_size * 2
+            )
+        else:
+            for index in indices:
+                yield from self._scan_index(index, query, batch_size)
+    
+    def _scan_index(self, index: str, query: Dict[str, Any], batch_size: int) -> Iterator[Dict[str, Any]]:
+        """Stream a whole index through the scroll API, batch_size hits per page.
         
-        for index in indices:
-            # Build query based on extraction mode
-            query = {"query": {"match_all": {}}}
-            
-            if extraction_mode == 'incremental_date' and date_field:
-                # For now, just extract all data - state management would be added here
-                pass
-            
-            # Add size to query
-            query['size'] = batch_size
-            
-            try:
-                results = self.connector.search(index=index, body=query)
-                
-                for hit in results.get('hits', {}).get('hits', []):
-                    document = hit['_source']
-                    # Add index context
-                    document['_source_index'] = index
-                    document['_document_id'] = hit['_id']
-                    yield document
-                    
-            except Exception as e:
-                # Continue with other indices if one fails
-                continue
+        An index that fails before returning anything is skipped, as before; a
+        scroll that fails partway raises, so the extraction fails rather than
+        silently writing a partial index.
+        """
+        yielded = 0
+        try:
+            for hit in self.connector.scan(index, query, size=batch_size):
+                # Add index context
+                yield {**hit['_source'], '_source_index': index, '_document_id': hit['_id']}
+                yielded += 1
+        except Exception as e:
+            if yielded:
+                logger.error(f"Scroll of index '{index}' failed after {yielded} hits: {e}")
+                raise
+            # Continue with other indices if one can't be read at all
+            logger.warning(f"Skipping index '{index}': {e}")
 
 
 # Register the extractor
@@ -23,5 +23,7 @@ class ExtractorFactory:
         Raises:
             ValueError: If extractor type is not registered.
         """
-        extractor_class = ExtractorRegistry.get(extractor_type)
+        extractor_class = ExtractorRegistry.lookup(extractor_type)
+        if extractor_class is None:
+            raise ValueError(f"Extractor type '{extractor_type}' not registered")
         return extractor_class(name=extractor_type, connector=connector, config=config)
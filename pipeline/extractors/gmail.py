@@ -1,10 +1,19 @@
 # pipeline/extractors/gmail.py
-import base64
+import os
+from base64 import urlsafe_b64decode as _b64d
 from pathlib import Path
 from typing import Iterator, Dict, Any, List
 from .base import BaseExtractor
+from .writer import JSONArrayWriter
 from .registry import ExtractorRegistry
 
+# Computed once; used for every message and attachment
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+_ATTACHMENTS_BASE = _PROJECT_ROOT / 'data' / 'attachments'
+
+# Headers copied into document metadata
+_WANTED_HEADERS = frozenset(('subject', 'from', 'to', 'date'))
+
 
 class GmailExtractor(BaseExtractor):
     """
@@ -27,21 +36,23 @@ class GmailExtractor(BaseExtractor):
             Normalized document records with metadata and attachment references
         """
         message_ids = self._get_message_ids()
-        all_messages = []
-        
-        for message_id in message_ids:
-            raw_message = self.connector.get_message(message_id)
-            normalized_message = self._normalize_message(raw_message)
-            
-            if self._has_attachments(raw_message):
-                normalized_message['attachments'] = self._store_attachments(raw_message)
-            
-            all_messages.append(normalized_message)
-            yield normalized_message
+        fetch_batch_size = self.config.get('fetch_batch_size', 100)
         
-        # Store all messages using writer
-        from .writer import write
-        write(all_messages, 'extractors/gmail.json')
+        # Stream each message to storage as it is yielded instead of holding them all
+        with JSONArrayWriter('extractors/gmail.json') as writer:
+            # Fetch messages through batch requests instead of one round-trip each
+            for start in range(0, len(message_ids), fetch_batch_size):
+                raw_messages = self.connector.get_messages_batch(message_ids[start:start + fetch_batch_size])
+                
+                for raw_message in raw_messages:
+                    normalized_message = self._normalize_message(raw_message)
+                    
+                    attachments = self._collect_attachments(raw_message)
+                    if attachments:
+                        normalized_message['attachments'] = attachments
+                    
+                    writer.write(normalized_message)
+                    yield normalized_message
 
     def _get_message_ids(self) -> List[str]:
         """Get message IDs based on configuration.
@@ -80,10 +91,12 @@ class GmailExtractor(BaseExtractor):
         # Extract metadata
         metadata = {}
         for header in headers:
-            name = header.get('name', '').lower()
-            value = header.get('value', '')
-            if name in ['subject', 'from', 'to', 'date']:
-                metadata[name] = value
+            name = header.get('name')
+            if not name:
+                continue
+            name = name.lower()
+            if name in _WANTED_HEADERS:
+                metadata[name] = header.get('value', '')
         
         # Add labels
         metadata['labels'] = raw_message.get('labelIds', [])
@@ -108,108 +121,66 @@ class GmailExtractor(BaseExtractor):
         Returns:
             Body content (HTML or text)
         """
-        def extract_from_parts(parts):
-            for part in parts:
-                mime_type = part.get('mimeType', '')
-                
-                if 'text/html' in mime_type and 'data' in part.get('body', {}):
-                    return base64.urlsafe_b64decode(part['body']['data']).decode('utf-8')
-                elif 'text/plain' in mime_type and 'data' in part.get('body', {}):
-                    return base64.urlsafe_b64decode(part['body']['data']).decode('utf-8')
-                elif 'parts' in part:
-                    content = extract_from_parts(part['parts'])
-                    if content:
-                        return content
-            return ''
-        
-        # Check single part message first
-        if 'data' in payload.get('body', {}):
-            mime_type = payload.get('mimeType', '')
-            if 'text/html' in mime_type or 'text/plain' in mime_type:
-                return base64.urlsafe_b64decode(payload['body']['data']).decode('utf-8')
-        
-        # Check multipart message
-        if 'parts' in payload:
-            return extract_from_parts(payload['parts'])
-        
-        return ''
-    
-    def _has_attachments(self, raw_message: Dict[str, Any]) -> bool:
-        """Check if message has attachments.
-        
-        Args:
-            raw_message: Raw Gmail message data
+        # Iterative DFS in document order; the first HTML or plain-text part wins
+        stack = [payload]
+        while stack:
+            part = stack.pop()
+            mime_type = part.get('mimeType', '')
+            body = part.get('body', {})
             
-        Returns:
-            True if message has attachments
-        """
-        payload = raw_message.get('payload', {})
-        return self._find_attachment_parts(payload)
-    
-    def _find_attachment_parts(self, payload: Dict[str, Any]) -> bool:
-        """Recursively find attachment parts in payload.
-        
-        Args:
-            payload: Message payload part
+            # Placeholder parts carry an empty data string; nothing to decode
+            data = body.get('data')
+            if data and ('text/html' in mime_type or 'text/plain' in mime_type):
+                return _b64d(data).decode('utf-8', errors='replace')
             
-        Returns:
-            True if attachment parts found
-        """
-        if payload.get('filename') and payload.get('body', {}).get('attachmentId'):
-            return True
-        
-        if 'parts' in payload:
-            for part in payload['parts']:
-                if self._find_attachment_parts(part):
-                    return True
+            stack.extend(reversed(part.get('parts', ())))
         
-        return False
+        return ''
     
-    def _store_attachments(self, raw_message: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Store attachments and return metadata.
+    def _collect_attachments(self, raw_message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Find, download and store a message's attachments in one walk of its MIME tree.
         
         Args:
             raw_message: Raw Gmail message data
             
         Returns:
-            List of attachment metadata
+            List of attachment metadata (empty if the message has none)
         """
+        parts = []
+        self._collect_attachment_parts(raw_message.get('payload', {}), parts)
+        if not parts:
+            return []
+        
         message_id = raw_message.get('id', '')
         attachments_dir = self._get_attachments_path(message_id)
         attachments_dir.mkdir(parents=True, exist_ok=True)
         
         attachments = []
-        payload = raw_message.get('payload', {})
         
-        self._extract_attachments_recursive(payload, message_id, attachments_dir, attachments)
+        # Download all of the message's attachments in one batch request
+        refs = [(message_id, part['body']['attachmentId']) for part in parts]
+        fetched = self.connector.get_attachments_batch(refs)
         
-        return attachments
-    
-    def _extract_attachments_recursive(self, part: Dict[str, Any], message_id: str, 
-                                     attachments_dir: Path, attachments: List[Dict[str, Any]]) -> None:
-        """Recursively extract and store attachments.
-        
-        Args:
-            part: Message payload part
-            message_id: Gmail message ID
-            attachments_dir: Directory to store attachments
-            attachments: List to append attachment metadata
-        """
-        if part.get('filename') and part.get('body', {}).get('attachmentId'):
-            attachment_id = part['body']['attachmentId']
+        for part, attachment_data in zip(parts, fetched):
             filename = part['filename']
             
             try:
-                attachment_data = self.connector.get_attachment(message_id, attachment_id)
+                if isinstance(attachment_data, Exception):
+                    raise attachment_data
                 
-                if 'data' in attachment_data:
-                    content = base64.urlsafe_b64decode(attachment_data['data'])
+                data = attachment_data.get('data')
+                if data:
+                    content = _b64d(data)
                     
                     attachment_path = attachments_dir / filename
-                    with open(attachment_path, 'wb') as f:
-                        f.write(content)
+                    # Content is already in memory; skip the buffered file object
+                    fd = os.open(attachment_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                    try:
+                        os.write(fd, content)
+                    finally:
+                        os.close(fd)
                     
-                    relative_path = str(attachment_path.relative_to(self._get_project_root()))
+                    relative_path = str(attachment_path.relative_to(_PROJECT_ROOT))
                     
                     attachments.append({
                         'filename': filename,
@@ -219,9 +190,21 @@ class GmailExtractor(BaseExtractor):
             except Exception as e:
                 print(f"Error extracting attachment {filename}: {e}")
         
-        if 'parts' in part:
-            for subpart in part['parts']:
-                self._extract_attachments_recursive(subpart, message_id, attachments_dir, attachments)
+        return attachments
+    
+    def _collect_attachment_parts(self, part: Dict[str, Any], parts: List[Dict[str, Any]]) -> None:
+        """Collect payload parts that reference an attachment, in document order.
+        
+        Args:
+            part: Message payload part
+            parts: List to append attachment parts to
+        """
+        stack = [part]
+        while stack:
+            part = stack.pop()
+            if part.get('filename') and part.get('body', {}).get('attachmentId'):
+                parts.append(part)
+            stack.extend(reversed(part.get('parts', ())))
     
     def _get_attachments_path(self, message_id: str) -> Path:
         """Get attachments directory path for message.
@@ -232,15 +215,7 @@ class GmailExtractor(BaseExtractor):
         Returns:
             Path to attachments directory
         """
-        return self._get_project_root() / 'data' / 'attachments' / message_id
-    
-    def _get_project_root(self) -> Path:
-        """Get project root directory path.
-        
-        Returns:
-            Path to project root
-        """
-        return Path(__file__).parent.parent.parent
+        return _ATTACHMENTS_BASE / message_id
 
 
 # Register extractor
@@ -1,25 +1,26 @@
 # pipeline/extractors/manager.py
 import os
-import yaml
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from .factory import ExtractorFactory
-from ..connectors.manager import ConnectorManager
+from ..connectors.manager import ConnectorManager, get_connector_manager
+from ..config import load_yaml
 
 
 class ExtractorManager:
     """Manager class for handling multiple extractors."""
     
-    def __init__(self, config_path: str = None):
+    def __init__(self, config_path: str = None, connector_manager: Optional[ConnectorManager] = None):
         """Initialize ExtractorManager with optional config path.
         
         Args:
             config_path: Path to YAML config file. If None, uses 'extractor_config.yml'
+            connector_manager: Manager to take connectors from. If None, uses the shared default
         """
         if config_path is None:
             config_path = os.path.join(os.path.dirname(__file__), 'extractor_config.yml')
         
         self.config_path = config_path
-        self.connector_manager = ConnectorManager()
+        self.connector_manager = connector_manager or get_connector_manager()
         self._extractors: Dict[str, Any] = {}
         self._config: Dict[str, Any] = None
     
@@ -27,8 +28,7 @@ class ExtractorManager:
         """Load configuration from YAML file."""
         if self._config is None:
             try:
-                with open(self.config_path, 'r') as file:
-                    self._config = yaml.safe_load(file) or {}
+                self._config = load_yaml(self.config_path)
             except FileNotFoundError:
                 self._config = {}
             except Exception as e:
@@ -75,18 +75,20 @@ class ExtractorManager:
         """Run extraction for a specific extractor."""
         extractor = self.get_extractor(name)
         
-        # Connect if needed
-        if not extractor.connector.is_connected():
-            extractor.connector.connect()
+        # Connect if needed; the connector manager tracks what is already connected
+        self.connector_manager.connect(extractor.connector.name)
         
-        # Extract data
-        data = list(extractor.extract())
+        # Gmail streams its own output file; just drain it
+        if name == 'gmail':
+            for _ in extractor.extract():
+                pass
+            return
         
-        # Write to project storage (except Gmail which handles its own writing)
-        if name != 'gmail':
-            output_path = f"extractors/{name}.json"
-            from .writer import write
-            write(data, output_path)
+        # Stream records to project storage without materializing them
+        from .writer import JSONArrayWriter
+        with JSONArrayWriter(f"extractors/{name}.json") as writer:
+            for record in extractor.extract():
+                writer.write(record)
     
     def run_all_extractions(self) -> None:
         """Run all configured extractions."""
@@ -1,6 +1,8 @@
 # pipeline/extractors/postgres.py
+from functools import partial
 from typing import Iterator, Dict, Any
-from .base import BaseExtractor
+from psycopg2 import sql
+from .base import BaseExtractor, interleave
 from .registry import ExtractorRegistry
 
 
@@ -12,39 +14,75 @@ class PostgresExtractor(BaseExtractor):
         """Extract data from PostgreSQL tables based on configuration."""
         tables = self.config.get('tables', [])
         
-        for table_config in tables:
-            table_name = table_config.get('table_name')
-            schema = table_config.get('schema', 'public')
-            columns = table_config.get('columns')
-            extraction_mode = table_config.get('extraction_mode', 'full')
-            date_column = table_config.get('date_column')
-            batch_size = table_config.get('batch_size', 1000)
-            order_by = table_config.get('order_by')
-            
-            # Build query
-            if columns:
-                columns_str = ', '.join(columns)
-            else:
-                columns_str = '*'
-            
-            query = f"SELECT {columns_str} FROM {schema}.{table_name}"
-            
-            # Add incremental filter if specified
-            if extraction_mode == 'incremental_date' and date_column:
-                # For now, just extract all data - state management would be added here
-                pass
-            
-            # Add ordering
-            if order_by:
-                query += f" ORDER BY {order_by}"
-            
-            # Execute query
-            rows = self.connector.execute_query(query)
-            
-            # Add table name to each row for context
-            for row in rows:
-                row['_source_table'] = table_name
-                yield row
+        if self.config.get('parallel_tables', False) and len(tables) > 1:
+            # Tables are independent; overlap their round-trips on separate connections
+            yield from interleave(
+                [partial(self._extract_table_on_own_connection, table_config) for table_config in tables],
+                self.config.get('max_workers', 8)
+            )
+        else:
+            for table_config in tables:
+                yield from self._extract_one_table(table_config, self.connector)
+    
+    def _extract_table_on_own_connection(self, table_config: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Extract one table over a dedicated connection, as a connection runs one query at a time."""
+        connector = type(self.connector)(self.connector.name, self.connector.config)
+        connector.connect()
+        try:
+            yield from self._extract_one_table(table_config, connector)
+        finally:
+            connector.disconnect()
+    
+    def _extract_one_table(self, table_config: Dict[str, Any], connector) -> Iterator[Dict[str, Any]]:
+        """Stream the rows of one configured table."""
+        table_name = table_config.get('table_name')
+        schema = table_config.get('schema', 'public')
+        columns = table_config.get('columns')
+        extraction_mode = table_config.get('extraction_mode', 'full')
+        date_column = table_config.get('date_column')
+        batch_size = table_config.get('batch_size', 1000)
+        order_by = table_config.get('order_by')
+        use_copy = table_config.get('use_copy', False)
+        
+        # Build query with quoted identifiers
+        if columns:
+            columns_sql = sql.SQL(', ').join(map(sql.Identifier, columns))
+        else:
+            columns_sql = sql.SQL('*')
+        
+        query = sql.SQL("SELECT {} FROM {}").format(columns_sql, sql.Identifier(schema, table_name))
+        
+        # Add incremental filter if specified
+        if extraction_mode == 'incremental_date' and date_column:
+            # For now, just extract all data - state management would be added here
+            pass
+        
+        # Add ordering
+        if order_by:
+            query += sql.SQL(" ORDER BY {}").format(self._order_by(order_by))
+        
+        if use_copy and extraction_mode == 'full':
+            # Bulk COPY export; values arrive as text rather than typed
+            rows = connector.copy_query(query)
+        else:
+            # Stream rows batch_size at a time from a server-side cursor
+            rows = connector.execute_query(query, stream=True, arraysize=batch_size)
+        
+        # Add table name to each row for context
+        for row in rows:
+            row['_source_table'] = table_name
+            yield row
+    
+    @staticmethod
+    def _order_by(order_by: str) -> sql.Composed:
+        """Compose an ORDER BY list like "updated_at DESC, id" from quoted column names."""
+        terms = []
+        for term in order_by.split(','):
+            column, *direction = term.split()
+            if direction and (len(direction) > 1 or direction[0].upper() not in ('ASC', 'DESC')):
+                raise ValueError(f"Unsupported order_by term: '{term.strip()}'")
+            terms.append(sql.Identifier(column) + sql.SQL(f" {direction[0].upper()}" if direction else ""))
+        return sql.SQL(', ').join(terms)
 
 
 # Register the extractor
@@ -1,5 +1,6 @@
 # pipeline/extractors/registry.py
-from typing import Dict, Type
+from importlib import import_module
+from typing import Dict, Optional, Tuple, Type
 from .base import BaseExtractor
 
 
@@ -8,19 +9,43 @@ class ExtractorRegistry:
     
     _extractors: Dict[str, Type[BaseExtractor]] = {}
     
+    # Built-in extractor modules, imported the first time their type is requested
+    _modules: Dict[str, str] = {
+        "postgres": ".postgres",
+        "elasticsearch": ".elasticsearch",
+        "gmail": ".gmail",
+    }
+    
+    # Registered and built-in types, rebuilt only on register
+    _names: Tuple[str, ...] = tuple(_modules)
+    
     @classmethod
     def register(cls, extractor_type: str, extractor_class: Type[BaseExtractor]) -> None:
         """Register an extractor class."""
         cls._extractors[extractor_type] = extractor_class
+        cls._names = tuple(dict.fromkeys([*cls._modules, *cls._extractors]))
+    
+    @classmethod
+    def lookup(cls, extractor_type: str) -> Optional[Type[BaseExtractor]]:
+        """Get an extractor class by type, or None if it isn't registered."""
+        try:
+            return cls._extractors[extractor_type]
+        except KeyError:
+            pass
+        if extractor_type in cls._modules:
+            # Importing the module registers the extractor
+            import_module(cls._modules[extractor_type], __package__)
+        return cls._extractors.get(extractor_type)
     
     @classmethod
     def get(cls, extractor_type: str) -> Type[BaseExtractor]:
         """Get an extractor class by type."""
-        if extractor_type not in cls._extractors:
-            raise ValueError(f"Extractor type '{extractor_type}' not registered")
-        return cls._extractors[extractor_type]
+        extractor_class = cls.lookup(extractor_type)
+        if extractor_class is not None:
+            return extractor_class
+        raise ValueError(f"Extractor type '{extractor_type}' not registered")
     
     @classmethod
-    def list_extractors(cls) -> list[str]:
-        """List all registered extractor types."""
-        return list(cls._extractors.keys())
+    def list_extractors(cls) -> Tuple[str, ...]:
+        """List all registered and built-in extractor types."""
+        return cls._names
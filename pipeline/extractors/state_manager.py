@@ -1,22 +1,52 @@
 # pipeline/extractors/state_manager.py
-import json
+import atexit
+import os
 from pathlib import Path
 from typing import Optional
 
+import orjson
+
 
 class StateManager:
+    """Extraction state kept in memory and written to disk on flush()."""
+
     def __init__(self, path: str = ".extractor_state.json"):
         self.path = Path(path)
         self.state = self._load()
+        self._dirty = False
+        # Safety net for a manager that is never closed; close() takes it off the registry
+        atexit.register(self.flush)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Flush pending state and drop the exit hook so the instance can be released."""
+        self.flush()
+        atexit.unregister(self.flush)
 
     def _load(self):
-        if self.path.exists():
-            return json.loads(self.path.read_text())
-        return {}
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return {}
+        return orjson.loads(data) if data else {}
 
     def get(self, key: str) -> Optional[str]:
         return self.state.get(key)
 
     def set(self, key: str, value: str):
         self.state[key] = value
-        self.path.write_text(json.dumps(self.state, indent=2))
+        self._dirty = True
+
+    def flush(self):
+        """Write the state if it changed, swapping the file in atomically."""
+        if not self._dirty:
+            return
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_bytes(orjson.dumps(self.state))
+        os.replace(tmp, self.path)
+        self._dirty = False
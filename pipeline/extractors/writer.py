@@ -1,78 +1,112 @@
 # pipeline/extractors/writer.py
-import json
 import os
-import base64
-from typing import Any, Dict, Union
+from typing import Any, Dict, Iterable, List, Union
 
+import orjson
 
-def write(data: Union[Dict[str, Any], list], path: str) -> None:
+# Datetimes go through default=str so output matches the previous json.dump(default=str) format
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_DATACLASS
+
+
+def _dumps(data: Any, pretty: bool = False) -> bytes:
+    """Serialize to JSON bytes, compact unless pretty is set."""
+    option = _DUMPS_OPTIONS | orjson.OPT_INDENT_2 if pretty else _DUMPS_OPTIONS
+    return orjson.dumps(data, default=str, option=option)
+
+
+def write(data: Union[Dict[str, Any], Iterable[Any]], path: str, pretty: bool = False) -> None:
     """Write extractor output to project storage as JSON.
     
     Args:
-        data: Data to write (dict or list)
+        data: Data to write (dict, list, or any iterable of records, which is streamed)
         path: Output file path (relative to project root)
+        pretty: Indent the output
     """
-    # Get project root directory
-    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    
-    # Create full path relative to project root
-    full_path = os.path.join(project_root, "data", path)
+    if not isinstance(data, (dict, list)):
+        with JSONArrayWriter(path, pretty=pretty) as writer:
+            for record in data:
+                writer.write(record)
+        return
     
-    # Create directory if it doesn't exist
-    os.makedirs(os.path.dirname(full_path), exist_ok=True)
-    
-    # Handle Gmail messages with attachments
-    if path == 'extractors/gmail.json' and isinstance(data, list):
-        data = _process_gmail_attachments(data, project_root)
+    full_path = _prepare_path(path)
     
     # Write data as JSON
-    with open(full_path, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+    with open(full_path, 'wb') as f:
+        f.write(_dumps(data, pretty))
 
 
-def _process_gmail_attachments(messages: list, project_root: str) -> list:
-    """Process and store attachments from Gmail messages."""
-    processed_messages = []
+class JSONArrayWriter:
+    """Write records to a JSON array file one at a time.
     
-    for message in messages:
-        processed_message = message.copy()
-        
-        # Extract and store attachments if present
-        if 'payload' in message and 'parts' in message['payload']:
-            attachments = _extract_attachments_from_parts(message['payload']['parts'], message['id'], project_root)
-            if attachments:
-                processed_message['attachments'] = attachments
-        
-        processed_messages.append(processed_message)
+    Use as a context manager. Records go to ``<path>.tmp``, which is closed
+    and moved over the real path only on a clean exit; if the producer
+    raises, the partial file is deleted and any previous output is left
+    untouched, so readers never see a truncated array. Memory use stays
+    constant in the number of records.
+    """
     
-    return processed_messages
-
-
-def _extract_attachments_from_parts(parts: list, message_id: str, project_root: str) -> list:
-    """Extract attachments from message parts."""
-    attachments = []
+    def __init__(self, path: str, pretty: bool = False):
+        """
+        Args:
+            path: Output file path (relative to project root)
+            pretty: Indent each record
+        """
+        self.path = path
+        self.pretty = pretty
+        self._file = None
+        self._count = 0
+        self._full_path = None
+    
+    def __enter__(self) -> "JSONArrayWriter":
+        self._full_path = _prepare_path(self.path)
+        self._file = open(self._full_path + '.tmp', 'wb')
+        self._file.write(b'[')
+        return self
+    
+    def write(self, record: Any) -> None:
+        """Append one record to the array."""
+        self._file.write(b',\n' if self._count else b'\n')
+        self._file.write(_dumps(record, self.pretty))
+        self._count += 1
     
-    for part in parts:
-        if part.get('filename') and part.get('body', {}).get('attachmentId'):
-            filename = part['filename']
-            attachment_id = part['body']['attachmentId']
-            
-            # Create attachment directory
-            attachments_dir = os.path.join(project_root, "data", "attachments", message_id)
-            os.makedirs(attachments_dir, exist_ok=True)
-            
-            # Store attachment info
-            attachment_info = {
-                'filename': filename,
-                'attachment_id': attachment_id,
-                'mime_type': part.get('mimeType', 'application/octet-stream'),
-                'stored_path': f"data/attachments/{message_id}/{filename}"
-            }
-            attachments.append(attachment_info)
+    def write_many(self, records: List[Any]) -> None:
+        """Append a batch of records with a single serializer call."""
+        if not records:
+            return
+        self._file.write(b',\n' if self._count else b'\n')
+        # Serialize the batch as one array and splice its elements in without the brackets
+        self._file.write(_dumps(records, self.pretty)[1:-1].strip())
+        self._count += len(records)
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        tmp_path = self._full_path + '.tmp'
+        if exc_type is not None:
+            self._file.close()
+            os.unlink(tmp_path)
+            return
         
-        # Recursively check nested parts
-        if 'parts' in part:
-            nested_attachments = _extract_attachments_from_parts(part['parts'], message_id, project_root)
-            attachments.extend(nested_attachments)
+        self._file.write(b'\n]' if self._count else b']')
+        self._file.close()
+        os.replace(tmp_path, self._full_path)
+
+
+# Output directories already created by this process
+_created_dirs = set()
+
+
+def _project_root() -> str:
+    """Get project root directory."""
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _prepare_path(path: str) -> str:
+    """Resolve an output path under data/ and create its directory."""
+    # Create full path relative to project root
+    full_path = os.path.join(_project_root(), "data", path)
     
-    return attachments
+    # Create directory if it doesn't exist; skip the syscall for ones already made
+    directory = os.path.dirname(full_path)
+    if directory not in _created_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _created_dirs.add(directory)
+    return full_path
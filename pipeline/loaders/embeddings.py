@@ -1,10 +1,31 @@
 """
-Embeddings Module - Vector generation using txtai
+Embeddings Module - Vector generation using txtai or a Text Embeddings Inference server
 """
 
+import logging
+import time
 from typing import List, Dict, Any, Optional
 import numpy as np
-from txtai.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# Config keys handled by the aligner itself rather than passed to txtai
+ALIGNER_KEYS = {
+    "path", "enabled", "batch_size", "sort_by_length", "vector_precision",
+    "provider", "tei_url", "timeout"
+}
+
+
+def quantize_int8(vectors: np.ndarray) -> np.ndarray:
+    """Symmetric per-vector int8 quantization for Elasticsearch byte vectors.
+    
+    Each row is scaled so its largest component maps to 127. Cosine
+    similarity ignores the scale, so rankings match the float vectors.
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    scale = np.abs(vectors).max(axis=1, keepdims=True) / 127
+    scale[scale == 0] = 1
+    return np.round(vectors / scale).astype(np.int8)
 
 
 class EmbeddingAligner:
@@ -16,6 +37,9 @@ class EmbeddingAligner:
     - Use txtai only to generate vectors
     - NEVER let txtai index anything
     - Perform index alignment
+    
+    With `provider: tei`, vectors come from a Text Embeddings Inference
+    server (typically GPU-backed) over HTTP and txtai is never loaded.
     """
     
     def __init__(self, config: Dict[str, Any]):
@@ -26,11 +50,31 @@ class EmbeddingAligner:
             config: Embedding configuration following txtai's Embeddings format
         """
         self.config = config
+        self.batch_size = config.get("batch_size", 64)
+        self.sort_by_length = config.get("sort_by_length", True)
+        self.vector_precision = config.get("vector_precision", "float32")
+        self.provider = config.get("provider", "txtai")
         self.embeddings = None
-        self._initialize_embeddings()
+        self._client = None
+        if self.provider == "tei":
+            self._initialize_tei()
+        else:
+            self._initialize_embeddings()
+    
+    def _initialize_tei(self):
+        """Open a pooled HTTP client to a Text Embeddings Inference server."""
+        import httpx
+        
+        if not self.config.get("tei_url"):
+            raise ValueError("Embeddings provider 'tei' requires 'tei_url'")
+        
+        self.endpoint = f"{self.config['tei_url'].rstrip('/')}/embed"
+        self._client = httpx.Client(timeout=self.config.get("timeout", 30))
     
     def _initialize_embeddings(self):
         """Initialize txtai Embeddings without indexing."""
+        from txtai.embeddings import Embeddings
+        
         # Create embeddings instance without storage/indexing
         embeddings_config = {
             "path": self.config.get("path", "sentence-transformers/all-MiniLM-L6-v2"),
@@ -41,7 +85,7 @@ class EmbeddingAligner:
         
         # Add any additional txtai Embeddings parameters from config
         for key, value in self.config.items():
-            if key not in ["path", "enabled"]:
+            if key not in ALIGNER_KEYS:
                 embeddings_config[key] = value
         
         self.embeddings = Embeddings(embeddings_config)
@@ -59,33 +103,40 @@ class EmbeddingAligner:
         if not chunks:
             return []
         
-        # Prepare data for txtai: (chunk_id, text, tags)
-        txtai_input = []
-        chunk_mapping = {}  # Map chunk_id to original chunk
+        # Generate vectors using txtai (embedding only, no indexing),
+        # batch_size texts per model call
+        texts = [chunk.text for chunk in chunks]
+        if self.sort_by_length:
+            # Similar-length texts share a batch, so less of each batch is padding
+            order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+            texts = [texts[i] for i in order]
+        
+        vectors = np.concatenate([
+            self._transform(texts[i:i + self.batch_size])
+            for i in range(0, len(texts), self.batch_size)
+        ])
+        
+        if self.sort_by_length:
+            # Restore chunk order with one scatter
+            restored = np.empty_like(vectors)
+            restored[order] = vectors
+            vectors = restored
         
-        for chunk in chunks:
-            txtai_input.append((chunk.chunk_id, chunk.text, chunk.metadata))
-            chunk_mapping[chunk.chunk_id] = chunk
+        if self.vector_precision == "int8":
+            # Small ints instead of floats: ~4x smaller bulk payloads and index
+            vectors = quantize_int8(vectors)
         
-        # Generate vectors using txtai (embedding only, no indexing)
-        # Generate vectors for each text individually
-        vectors_list = []
-        for item in txtai_input:
-            vector = self.embeddings.transform([item[1]])  # Transform each text individually
-            vectors_list.append(vector)
+        # One C-level conversion to nested lists
+        vectors_list = vectors.tolist()
         
         # Create aligned records
         aligned_records = []
-        for i, (chunk_id, text, tags) in enumerate(txtai_input):
-            original_chunk = chunk_mapping[chunk_id]
-            
-            vector = vectors_list[i].tolist() if hasattr(vectors_list[i], 'tolist') else vectors_list[i]
-            
+        for chunk, vector in zip(chunks, vectors_list):
             aligned_record = {
-                'source_id': original_chunk.source_id,
-                'chunk_id': chunk_id,
-                'text': text,
-                'metadata': tags,
+                'source_id': chunk.source_id,
+                'chunk_id': chunk.chunk_id,
+                'text': chunk.text,
+                'metadata': chunk.metadata,
                 'vector': vector
             }
             aligned_records.append(aligned_record)
@@ -105,20 +156,25 @@ class EmbeddingAligner:
         if not texts:
             return []
         
-        vectors = self.embeddings.transform(texts)
-        
-        # Convert to list format if needed
-        result = []
-        for vector in vectors:
-            if hasattr(vector, 'tolist'):
-                result.append(vector.tolist())
-            else:
-                result.append(vector)
+        # One C-level conversion to nested lists
+        return self._transform(texts).tolist()
+    
+    def _transform(self, texts: List[str]) -> np.ndarray:
+        """Embed one batch of texts as a 2-D float array."""
+        if self._client is None:
+            return np.asarray(self.embeddings.transform(texts))
         
-        return result
+        start = time.perf_counter()
+        response = self._client.post(self.endpoint, json={"inputs": texts, "truncate": True})
+        response.raise_for_status()
+        vectors = np.asarray(response.json(), dtype=np.float32)
+        logger.debug("TEI embedded %d texts in %.1f ms", len(texts), (time.perf_counter() - start) * 1000)
+        return vectors
     
     def __del__(self):
         """Cleanup resources."""
+        if self._client is not None:
+            self._client.close()
         if self.embeddings:
             # Ensure no indexing or storage operations occur
             pass
@@ -3,17 +3,12 @@ Simple Ingestor Module - Elasticsearch indexing logic using connectors
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import time
 import logging
-from datetime import datetime
-import sys
-from pathlib import Path
+from datetime import datetime, timezone
 
-# Add pipeline path for connector imports
-sys.path.append(str(Path(__file__).parent.parent.parent))
-
-from pipeline.connectors.manager import ConnectorManager
+from ..connectors.manager import get_connector_manager
 
 
 class BaseIngestor(ABC):
@@ -29,30 +24,61 @@ class BaseElasticsearchIngestor(BaseIngestor):
     """Base class for Elasticsearch ingestors with common functionality."""
     
     def __init__(self, config: Dict[str, Any]):
-        """Initialize using connector."""
+        """Initialize using connector.
+        
+        Args:
+            config: Backend configuration
+        """
         self.config = config
         self.connector_name = config.get('connector_name', 'elasticsearch')
         self.index_name = config.get('index_name', 'healthai_vectors')
         self.max_retries = config.get('max_retries', 3)
+        self.vector_element_type = config.get('vector_element_type', 'float')
+        self._index_ready = False
         self.logger = logging.getLogger(__name__)
         
-        # Get connector from manager
-        connector_manager = ConnectorManager()
-        self.connector = connector_manager.get_connector(self.connector_name)
-        if not self.connector:
-            raise ConnectionError(f"Connector '{self.connector_name}' not found")
+        # Every ingestor shares one connection per connector name
+        self.connector = get_connector_manager().connect(self.connector_name)
+    
+    def _ensure_index(self, records: List[Dict[str, Any]]) -> None:
+        """Create the index with a dense_vector mapping sized from the records, if missing."""
+        if self._index_ready:
+            return
+        vector = next((r['vector'] for r in records if r.get('vector') is not None), None)
+        if vector is None:
+            return
+        # Checked once per ingestor; later batches skip the round-trip
+        self._index_ready = True
+        if self.connector.index_exists(self.index_name):
+            return
         
-        # Connect to Elasticsearch
-        self.connector.connect()
+        self.connector.create_index(self.index_name, body={
+            "mappings": {
+                "properties": {
+                    "vector": {
+                        "type": "dense_vector",
+                        "dims": len(vector),
+                        "element_type": self.vector_element_type,
+                        "index": True,
+                        "similarity": "cosine"
+                    }
+                }
+            }
+        })
     
-    def _create_document(self, record: Dict[str, Any]) -> Dict[str, Any]:
-        """Create Elasticsearch document from record."""
+    def _create_document(self, record: Dict[str, Any], ingested_at: Optional[str] = None) -> Dict[str, Any]:
+        """Create Elasticsearch document from record.
+        
+        Args:
+            record: Aligned record
+            ingested_at: ISO timestamp shared by a batch; defaults to now
+        """
         doc = {
             'source_id': record['source_id'],
             'chunk_id': record['chunk_id'],
             'text': record['text'],
             'metadata': record['metadata'],
-            'ingested_at': datetime.utcnow().isoformat()
+            'ingested_at': ingested_at or datetime.now(timezone.utc).isoformat()
         }
         
         # Add vector if present
@@ -71,6 +97,7 @@ class SingleIngestor(BaseElasticsearchIngestor):
             self.logger.warning("No records to ingest")
             return True
         
+        self._ensure_index(records)
         success_count = 0
         
         for record in records:
@@ -106,66 +133,71 @@ class SingleIngestor(BaseElasticsearchIngestor):
 
 
 class BulkIngestor(BaseElasticsearchIngestor):
-    """Simple bulk ingestor for Elasticsearch."""
+    """Bulk ingestor for Elasticsearch, sending batches from a thread pool."""
     
     def __init__(self, config: Dict[str, Any]):
         """Initialize bulk ingestor using connector."""
         super().__init__(config)
         self.batch_size = config.get('batch_size', 100)
+        self.thread_count = config.get('thread_count', 4)
     
     def ingest(self, records: List[Dict[str, Any]]) -> bool:
-        """Ingest records in batches."""
+        """Ingest records in concurrent batches, retrying only the items that failed."""
         if not records:
             self.logger.warning("No records to ingest")
             return True
         
-        success_count = 0
+        self._ensure_index(records)
         total_count = len(records)
+        pending = records
         
-        # Process in batches
-        for i in range(0, total_count, self.batch_size):
-            batch = records[i:i + self.batch_size]
-            
-            if self._ingest_batch(batch):
-                success_count += len(batch)
-            else:
-                # Fall back to single ingest for failed batch
-                self.logger.warning(f"Batch failed, falling back to single ingest")
-                single_ingestor = SingleIngestor(self.config)
-                if single_ingestor.ingest(batch):
-                    success_count += len(batch)
-        
-        self.logger.info(f"Ingested {success_count}/{total_count} records successfully")
-        return success_count == total_count
-    
-    def _ingest_batch(self, records: List[Dict[str, Any]]) -> bool:
-        """Ingest a batch of records."""
-        actions = []
+        for attempt in range(self.max_retries):
+            pending = self._ingest_parallel(pending)
+            if not pending:
+                break
+            self.logger.warning(f"Bulk ingest had {len(pending)} errors (attempt {attempt + 1}/{self.max_retries})")
+            if attempt < self.max_retries - 1:
+                time.sleep(self.max_retries * (attempt + 1))
         
+        for record in pending:
+            self.logger.error(f"Failed to ingest record {record['chunk_id']}")
+        
+        self.logger.info(f"Ingested {total_count - len(pending)}/{total_count} records successfully")
+        return not pending
+    
+    def _actions(self, records: List[Dict[str, Any]]):
+        """Generate index actions for records."""
+        # One timestamp for the whole bulk call
+        ingested_at = datetime.now(timezone.utc).isoformat()
         for record in records:
-            doc = self._create_document(record)
-            action = {
+            yield {
+                "_op_type": "index",
                 "_index": self.index_name,
                 "_id": record['chunk_id'],
-                "_source": doc
+                "_source": self._create_document(record, ingested_at)
             }
-            actions.append(action)
+    
+    def _ingest_parallel(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Bulk index records and return the ones that failed."""
+        by_id = {str(record['chunk_id']): record for record in records}
+        failed = []
         
-        for attempt in range(self.max_retries):
-            try:
-                response = self.connector.bulk(actions)
-                
-                if response.get('failed_count', 0) > 0:
-                    self.logger.warning(f"Bulk ingest had {response['failed_count']} errors")
-                    return False
-                
-                self.logger.info(f"Successfully bulk ingested {len(records)} records")
-                return True
-                
-            except Exception as e:
-                if attempt == self.max_retries - 1:
-                    self.logger.error(f"Failed bulk ingest: {str(e)}")
-                    return False
-                time.sleep(self.max_retries * (attempt + 1))
+        try:
+            results = self.connector.parallel_bulk(
+                self._actions(records),
+                thread_count=self.thread_count,
+                chunk_size=self.batch_size
+            )
+            for ok, item in results:
+                if not ok:
+                    # item is {op_type: {"_id": ..., "error"/"exception": ...}}
+                    info = next(iter(item.values()))
+                    self.logger.debug(f"Bulk item failed: {info.get('error') or info.get('exception')}")
+                    record = by_id.get(str(info.get('_id')))
+                    if record is not None:
+                        failed.append(record)
+        except Exception as e:
+            self.logger.error(f"Failed bulk ingest: {str(e)}")
+            return records
         
-        return False
+        return failed
@@ -2,10 +2,12 @@
 Loader Runner - Orchestrator for loading process
 """
 
-import json
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from queue import Queue
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Optional
 from dataclasses import dataclass
+import ijson
 import yaml
 
 from .embeddings import EmbeddingAligner
@@ -13,7 +15,7 @@ from .ingestor import BaseIngestor
 from .factory import LoaderFactory
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Chunk:
     """Data structure for chunk information"""
     source_id: str
@@ -39,42 +41,70 @@ class LoaderRunner:
         self.config = self._load_config()
         self.embedding_aligner = None
         self.ingestor = None
+        pipeline_config = self.config.get('pipeline', {})
+        self.batch_size = pipeline_config.get('batch_size', 128)
+        self.queue_size = pipeline_config.get('queue_size', 2)
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
         with open(self.config_path, 'r') as f:
             return yaml.safe_load(f)
     
-    def _read_transformed_file(self, transformer_name: str) -> List[Chunk]:
-        """Read transformed JSON file and convert to Chunk objects."""
-        file_path = self.data_dir / 'transformed' / f'{transformer_name}.json'
+    def _transformed_path(self, transformer_name: str) -> Path:
+        """Path of a transformed file, checked up front before components connect."""
+        # Transformers write JSON, Parquet or msgpack; take the newest if several are present
+        candidates = [
+            path for path in (self.data_dir / 'transformed' / f'{transformer_name}{suffix}' for suffix in ('.json', '.parquet', '.msgpack'))
+            if path.exists()
+        ]
         
-        if not file_path.exists():
-            raise FileNotFoundError(f"Transformed file not found: {file_path}")
+        if not candidates:
+            raise FileNotFoundError(f"Transformed file not found: {self.data_dir / 'transformed' / transformer_name}.json")
         
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-        
-        chunks = []
-        for item in data:
-            # Convert list format back to tuple-like structure
-            chunk_id, text, metadata = item
-            
+        return max(candidates, key=lambda path: path.stat().st_mtime)
+    
+    def _iter_transformed_file(self, transformer_name: str) -> Iterator[Chunk]:
+        """Stream a transformed JSON file as Chunk objects, one array element at a time."""
+        return (Chunk(*fields) for fields in self._iter_items(self._transformed_path(transformer_name)))
+    
+    def _direct_ingest_iter(self, transformer_name: str) -> Iterator[Dict[str, Any]]:
+        """Stream a transformed JSON file straight into ingest records, with no Chunk in between."""
+        return (
+            {'source_id': source_id, 'chunk_id': chunk_id, 'text': text, 'metadata': metadata, 'vector': None}
+            for source_id, chunk_id, text, metadata in self._iter_items(self._transformed_path(transformer_name))
+        )
+    
+    @staticmethod
+    def _iter_items(file_path: Path) -> Iterator[tuple]:
+        """Parse [chunk_id, text, metadata] rows into (source_id, chunk_id, text, metadata)."""
+        for chunk_id, text, metadata in LoaderRunner._iter_rows(file_path):
             # Extract source_id from chunk_id (before _chunk_ if present)
-            chunk_id_str = str(chunk_id)
-            if '_chunk_' in chunk_id_str:
-                source_id = chunk_id_str.split('_chunk_')[0]
-            else:
-                source_id = chunk_id_str
+            chunk_id = str(chunk_id)
+            source_id = chunk_id.split('_chunk_')[0] if '_chunk_' in chunk_id else chunk_id
+            yield source_id, chunk_id, text, metadata
+    
+    @staticmethod
+    def _iter_rows(file_path: Path) -> Iterator[tuple]:
+        """Stream (id, text, tags) rows from a JSON array, Parquet or msgpack file."""
+        if file_path.suffix == '.parquet':
+            # pyarrow is only needed when a transformer wrote Parquet
+            import pyarrow.parquet as pq
             
-            chunks.append(Chunk(
-                source_id=source_id,
-                chunk_id=str(chunk_id),
-                text=text,
-                metadata=metadata
-            ))
-        
-        return chunks
+            for batch in pq.ParquetFile(file_path).iter_batches(columns=['id', 'text', 'tags']):
+                yield from zip(*(column.to_pylist() for column in batch.columns))
+            return
+        
+        if file_path.suffix == '.msgpack':
+            # msgpack is only needed when a transformer wrote msgpack
+            import msgpack
+            
+            with open(file_path, 'rb') as f:
+                yield from msgpack.Unpacker(f, raw=False)
+            return
+        
+        with open(file_path, 'rb') as f:
+            # use_float keeps numbers as floats rather than Decimal, as json.load did
+            yield from ijson.items(f, 'item', use_float=True)
     
     def _initialize_components(self):
         """Initialize embedding aligner and ingestor based on config."""
@@ -93,19 +123,6 @@ class LoaderRunner:
         
         return self.embedding_aligner.align_and_embed(chunks)
     
-    def _process_without_embedding(self, chunks: List[Chunk]) -> List[Dict[str, Any]]:
-        """Process chunks without embedding (direct ingestion)."""
-        aligned_records = []
-        for chunk in chunks:
-            aligned_records.append({
-                'source_id': chunk.source_id,
-                'chunk_id': chunk.chunk_id,
-                'text': chunk.text,
-                'metadata': chunk.metadata,
-                'vector': None  # No vector for direct ingestion
-            })
-        return aligned_records
-    
     def run_loader(self, transformer_name: str) -> str:
         """
         Run the complete loading process for a transformer.
@@ -117,24 +134,21 @@ class LoaderRunner:
             Status message
         """
         try:
-            # Read transformed data
-            chunks = self._read_transformed_file(transformer_name)
-            print(f"Loaded {len(chunks)} chunks from {transformer_name}")
+            # Stream transformed data; items are read as the pipeline needs them
+            if self.config.get('embeddings', {}).get('enabled', False):
+                items = self._iter_transformed_file(transformer_name)
+                process = self._process_with_embedding
+            else:
+                # Without embeddings the parsed items already are the ingest records
+                items = self._direct_ingest_iter(transformer_name)
+                process = None
             
             # Initialize components
             self._initialize_components()
             
-            # Process based on embedding configuration
-            if self.config.get('embeddings', {}).get('enabled', False):
-                aligned_records = self._process_with_embedding(chunks)
-                print(f"Generated embeddings for {len(aligned_records)} chunks")
-            else:
-                aligned_records = self._process_without_embedding(chunks)
-                print(f"Prepared {len(aligned_records)} chunks for direct ingestion")
-            
-            # Ingest to backend
-            self.ingestor.ingest(aligned_records)
-            print(f"Successfully ingested {len(aligned_records)} records")
+            # Embed and ingest batch by batch, overlapping the two stages
+            count = self._run_pipeline(self._batches(items), process)
+            print(f"Successfully ingested {count} records from {transformer_name}")
             
             return f"Successfully loaded {transformer_name}"
             
@@ -143,6 +157,68 @@ class LoaderRunner:
             print(error_msg)
             return error_msg
     
+    def _batches(self, items: Iterable[Any]) -> Iterator[List[Any]]:
+        """Group chunks or records into lists of batch_size."""
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def _run_pipeline(self, batches: Iterable[List[Any]],
+                      process: Optional[Callable[[List[Chunk]], List[Dict[str, Any]]]]) -> int:
+        """
+        Process batches on this thread while a second thread ingests them.
+        
+        The bounded queue lets embedding of the next batch overlap ingestion
+        of the previous one while capping how many batches are held in memory.
+        Without a process function, batches are already ingest records.
+        
+        Returns:
+            Number of records ingested
+            
+        Raises:
+            The first ingestion error, including a batch the ingestor reported as failed
+        """
+        records_queue: Queue = Queue(maxsize=self.queue_size)
+        errors = []
+        count = 0
+        
+        def consume():
+            nonlocal count
+            while True:
+                records = records_queue.get()
+                if records is None:
+                    return
+                # Keep draining after a failure so the producer never blocks
+                if errors:
+                    continue
+                try:
+                    # False means some records were still failing after the ingestor's retries
+                    if not self.ingestor.ingest(records):
+                        raise RuntimeError(f"Ingestion failed for a batch of {len(records)} records after retries")
+                    count += len(records)
+                except Exception as e:
+                    errors.append(e)
+        
+        consumer = threading.Thread(target=consume, name="loader-ingest", daemon=True)
+        consumer.start()
+        try:
+            for batch in batches:
+                if errors:
+                    break
+                records_queue.put(process(batch) if process else batch)
+        finally:
+            records_queue.put(None)
+            consumer.join()
+        
+        if errors:
+            raise errors[0]
+        return count
+    
     def run_all_loaders(self) -> Dict[str, str]:
         """
         Run loaders for all available transformers.
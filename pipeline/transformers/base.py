@@ -1,6 +1,28 @@
 # pipeline/transformers/base.py
+import mmap
+import os
 from abc import ABC, abstractmethod
-from typing import Iterator, Tuple, Any, Dict
+from pathlib import Path
+from typing import Iterator, List, Tuple, Any, Dict, Union
+
+import orjson
+
+# Project data directory holding extractor output, attachments and transformed files
+DATA_DIR = Path(__file__).resolve().parents[2] / 'data'
+
+
+def mmap_json(path: Union[str, Path]) -> Any:
+    """Parse a JSON file straight from a read-only memory map, without copying it into a bytes object."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if os.fstat(fd).st_size == 0:
+            # mmap can't map an empty file; let orjson raise the usual decode error
+            return orjson.loads(b"")
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+    finally:
+        os.close(fd)
 
 
 class BaseTransformer(ABC):
@@ -13,11 +35,21 @@ class BaseTransformer(ABC):
         self.config = config
 
     @abstractmethod
-    def transform(self) -> Iterator[Tuple[str, str, list]]:
+    def transform_batches(self) -> Iterator[List[Tuple[str, str, Tuple[str, ...]]]]:
         """
-        Transform data into (id, text, tags) tuples.
+        Transform data into batches of (id, text, tags) tuples.
         
         Returns:
-            Iterator of (id, text, tags) tuples
+            Iterator of lists of (id, text, tags) tuples
         """
         pass
+
+    def transform(self) -> Iterator[Tuple[str, str, Tuple[str, ...]]]:
+        """
+        Transform data into (id, text, tags) tuples, one at a time.
+        
+        Returns:
+            Iterator of (id, text, tags) tuples
+        """
+        for batch in self.transform_batches():
+            yield from batch
@@ -1,10 +1,18 @@
 # pipeline/transformers/document_transformer.py
-from typing import Iterator, Tuple, Any, Dict
+import hashlib
+import os
+import sys
+from collections import OrderedDict
+from typing import Iterator, List, Tuple, Any, Dict
 from pathlib import Path
-import json
-from .base import BaseTransformer
+import ijson
+import orjson
+from .base import BaseTransformer, DATA_DIR
 from txtai.pipeline.data.textractor import Textractor
 
+# Attachment types without text extraction yet, indexed by a placeholder
+_DOC_EXTS = frozenset({'.pdf', '.doc', '.docx'})
+
 
 class DocumentTransformer(BaseTransformer):
     """
@@ -14,7 +22,16 @@ class DocumentTransformer(BaseTransformer):
     def __init__(self, name: str, config: Dict[str, Any]):
         super().__init__(name, config)
         self.include_attachments = config.get('include_attachments', True)
-        self.attachment_extensions = config.get('attachment_extensions', ['.pdf', '.txt', '.doc', '.docx'])
+        self.attachment_extensions = frozenset(config.get('attachment_extensions', ['.pdf', '.txt', '.doc', '.docx']))
+        self.batch_size = config.get('batch_size', 64)
+        # Segmentation results keyed by text digest; replies and notifications repeat bodies often
+        self.segment_cache_size = config.get('segment_cache_size', 10000)
+        self._segment_cache: OrderedDict = OrderedDict()
+        # Canonical tag tuples; records sharing a sender and labels share one tuple
+        self.tag_pool_size = config.get('tag_pool_size', 10000)
+        self._tag_pool: OrderedDict = OrderedDict()
+        # Attachment directory listings for the current run; one scandir covers all of a message's files
+        self._dir_listings: Dict[str, frozenset] = {}
         
         # Initialize txtai Textractor pipeline with all parameters
         textractor_config = config.get('textractor', {})
@@ -23,42 +40,55 @@ class DocumentTransformer(BaseTransformer):
         # Pass all parameters to Textractor (it inherits from Segmentation)
         all_config = {**textractor_config, **segmentation_config}
         self.textractor = Textractor(**all_config)
+        # Text digests are keyed on the segmentation settings, so cached chunks never outlive a config change
+        self._digest_key = hashlib.blake2b(orjson.dumps(all_config, option=orjson.OPT_SORT_KEYS), digest_size=32).digest()
+        self._disk_cache = self._open_disk_cache() if config.get('disk_cache', False) else None
+        # Segmentation returns a list of chunks when any split mode is on and results aren't joined
+        self._returns_list = (
+            any(getattr(self.textractor, mode, None) for mode in ('sentences', 'lines', 'paragraphs', 'sections'))
+            and not getattr(self.textractor, 'join', False)
+        )
+
+    def _open_disk_cache(self):
+        """Open the on-disk segmentation cache shared by every run of this transformer."""
+        # diskcache is only needed when the persistent cache is enabled
+        from diskcache import Cache
+        
+        return Cache(str(DATA_DIR / 'cache' / self.name), size_limit=self.config.get('disk_cache_size', 1 << 30))
 
-    def transform(self) -> Iterator[Tuple[str, str, list]]:
+    def transform_batches(self) -> Iterator[List[Tuple[str, str, Tuple[str, ...]]]]:
         """
-        Transform unstructured data into (id, text, tags) tuples.
+        Transform unstructured data into batches of (id, text, tags) tuples.
         
         Returns:
-            Iterator of (id, text, tags) tuples
+            Iterator of lists of (id, text, tags) tuples, one per Textractor batch
         """
         # Read extractor output
-        data_dir = Path(__file__).parent.parent.parent / 'data'
-        file_path = data_dir / 'extractors' / f'{self.config.get("source", "gmail")}.json'
+        file_path = DATA_DIR / 'extractors' / f'{self.config.get("source", "gmail")}.json'
         
         if not file_path.exists():
             return
         
-        with open(file_path, 'r') as f:
-            records = json.load(f)
+        # Files may have changed since the last run
+        self._dir_listings.clear()
+        
+        # Stream records one at a time; only the current record is held in memory
+        with open(file_path, 'rb') as f:
+            yield from self._transform_records(ijson.items(f, 'item', use_float=True))
+
+    def _transform_records(self, records: Iterator[Dict[str, Any]]) -> Iterator[List[Tuple[str, str, Tuple[str, ...]]]]:
+        """Chunk each record's body and attachments into batches of (id, text, tags) tuples."""
+        # (id, text, tags) jobs waiting for one batched Textractor call
+        pending = []
         
         for record in records:
             record_id = record.get('id', '')
+            tags = self._extract_tags(record)
             
             # Process email body
             body = record.get('body', '')
             if body:
-                # Use txtai Textractor as callable to get chunks (not text() method)
-                processed_chunks = self.textractor(body)
-                
-                # Textractor returns list of chunks when segmentation is enabled
-                if isinstance(processed_chunks, list):
-                    for i, chunk in enumerate(processed_chunks):
-                        chunk_id = f"{record_id}_chunk_{i}"
-                        tags = self._extract_tags(record)
-                        yield (chunk_id, chunk, tags)
-                else:
-                    tags = self._extract_tags(record)
-                    yield (record_id, processed_chunks, tags)
+                pending.append((record_id, body, tags))
             
             # Process attachments if enabled
             if self.include_attachments and 'attachments' in record:
@@ -67,54 +97,128 @@ class DocumentTransformer(BaseTransformer):
                     attachment_text = self._extract_attachment_text(attachment)
                     
                     if attachment_text:
-                        # Use txtai Textractor as callable to get chunks
-                        processed_chunks = self.textractor(attachment_text)
-                        
-                        if isinstance(processed_chunks, list):
-                            for i, chunk in enumerate(processed_chunks):
-                                chunk_id = f"{attachment_id}_chunk_{i}"
-                                tags = self._extract_tags(record) + [f"attachment:{attachment['filename']}"]
-                                yield (chunk_id, chunk, tags)
-                        else:
-                            tags = self._extract_tags(record) + [f"attachment:{attachment['filename']}"]
-                            yield (attachment_id, processed_chunks, tags)
+                        pending.append((attachment_id, attachment_text, tags + (f"attachment:{attachment['filename']}",)))
+            
+            if len(pending) >= self.batch_size:
+                yield self._segment(pending)
+                pending = []
+        
+        if pending:
+            yield self._segment(pending)
+
+    def _segment(self, jobs: list) -> List[Tuple[str, str, Tuple[str, ...]]]:
+        """Run one batch of texts through Textractor and return their chunks."""
+        keys = [
+            hashlib.blake2b(text.encode('utf-8', 'ignore'), digest_size=16, key=self._digest_key).digest()
+            for _, text, _ in jobs
+        ]
+        
+        # Resolve cached texts; segment each uncached text once, even if it repeats within the batch
+        resolved, misses = {}, {}
+        for key, (_, text, _) in zip(keys, jobs):
+            if key in self._segment_cache:
+                self._segment_cache.move_to_end(key)
+                resolved[key] = self._segment_cache[key]
+            elif key not in misses:
+                misses[key] = text
+        
+        if misses and self._disk_cache is not None:
+            # Segmentation persisted by earlier runs
+            for key in list(misses):
+                stored = self._disk_cache.get(key)
+                if stored is not None:
+                    resolved[key] = self._segment_cache[key] = orjson.loads(stored)
+                    del misses[key]
+        
+        if misses:
+            # Textractor accepts a list of texts and returns one result per text
+            segmented = self.textractor(list(misses.values()))
+            for key, result in zip(misses, segmented):
+                resolved[key] = self._segment_cache[key] = result
+            if self._disk_cache is not None:
+                # One transaction per batch rather than one commit per text
+                with self._disk_cache.transact():
+                    for key, result in zip(misses, segmented):
+                        self._disk_cache.set(key, orjson.dumps(result))
+        
+        while len(self._segment_cache) > self.segment_cache_size:
+            self._segment_cache.popitem(last=False)
+        
+        results = ((item_id, resolved[key], tags) for key, (item_id, _, tags) in zip(keys, jobs))
+        return (self._expand_list if self._returns_list else list)(results)
+
+    @staticmethod
+    def _expand_list(results: Iterator[tuple]) -> List[Tuple[str, str, Tuple[str, ...]]]:
+        """One tuple per segmented chunk."""
+        return [
+            (f"{item_id}_chunk_{i}", chunk, tags)
+            for item_id, chunks, tags in results
+            for i, chunk in enumerate(chunks)
+        ]
 
-    def _extract_tags(self, record: Dict[str, Any]) -> list:
-        """Extract tags from record metadata."""
+    def _extract_tags(self, record: Dict[str, Any]) -> Tuple[str, ...]:
+        """Extract tags from record metadata, shared by every chunk of the record."""
         tags = ['gmail']
         
         # Add tags from metadata
         metadata = record.get('metadata', {})
-        if 'subject' in metadata:
-            tags.append(f"subject:{metadata['subject'][:50]}")
-        if 'from' in metadata:
-            tags.append(f"from:{metadata['from']}")
-        if 'labels' in metadata:
-            for label in metadata['labels']:
-                tags.append(f"label:{label}")
+        subject = metadata.get('subject')
+        if subject is not None:
+            tags.append('subject:' + (subject if len(subject) <= 50 else subject[:50]))
+        sender = metadata.get('from')
+        if sender is not None:
+            tags.append(sys.intern('from:' + sender))
+        labels = metadata.get('labels')
+        if labels is not None:
+            tags += [sys.intern('label:' + label) for label in labels]
+        
+        tags = tuple(tags)
+        canonical = self._tag_pool.get(tags)
+        if canonical is not None:
+            self._tag_pool.move_to_end(tags)
+            return canonical
         
+        self._tag_pool[tags] = tags
+        if len(self._tag_pool) > self.tag_pool_size:
+            self._tag_pool.popitem(last=False)
         return tags
 
+    def _attachment_exists(self, path: Path) -> bool:
+        """Check for a file against a cached listing of its directory instead of a stat per file."""
+        directory = str(path.parent)
+        names = self._dir_listings.get(directory)
+        if names is None:
+            try:
+                with os.scandir(directory) as entries:
+                    names = frozenset(entry.name for entry in entries if entry.is_file())
+            except OSError:
+                names = frozenset()
+            self._dir_listings[directory] = names
+        return path.name in names
+
     def _extract_attachment_text(self, attachment: Dict[str, Any]) -> str:
         """Extract text from attachment file."""
-        attachment_path = Path(__file__).parent.parent.parent / 'data' / attachment['path']
-        
-        if not attachment_path.exists():
-            return ""
-        
         # Simple text extraction based on file extension
         extension = Path(attachment['filename']).suffix.lower()
+        if extension not in self.attachment_extensions:
+            return ""
+        
+        attachment_path = DATA_DIR / attachment['path']
+        
+        if not self._attachment_exists(attachment_path):
+            return ""
         
         if extension == '.txt':
             try:
-                with open(attachment_path, 'r', encoding='utf-8') as f:
-                    return f.read()
+                # One large buffered binary read, decoded once, instead of 8KB text-mode reads
+                with open(attachment_path, 'rb', buffering=1 << 20) as f:
+                    return f.read().decode('utf-8', errors='ignore')
             except Exception:
                 return ""
         
         # For PDF and other formats, return placeholder for now
         # OCR integration would go here in future
-        if extension in ['.pdf', '.doc', '.docx']:
+        if extension in _DOC_EXTS:
             return f"[Document: {attachment['filename']}]"
         
         return ""
@@ -1,7 +1,8 @@
 # pipeline/transformers/factory.py
-import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+from ..config import load_yaml
+from .base import BaseTransformer
 from .registry import TransformerRegistry
 from .tabular_transformer import TabularTransformer
 from .document_transformer import DocumentTransformer
@@ -15,16 +16,31 @@ class TransformerFactory:
             config_path = Path(__file__).parent / 'transformer_config.yml'
         self.config_path = config_path
         self._config = None
+        self._names: Optional[Tuple[str, ...]] = None
+        # Built transformers by name; txtai pipelines load their models once per factory
+        self._instances: Dict[str, BaseTransformer] = {}
     
     def load_config(self) -> Dict[str, Any]:
-        """Load transformer configuration from YAML."""
+        """Load transformer configuration from YAML (libyaml loader, shared cache)."""
         if self._config is None:
-            with open(self.config_path, 'r') as f:
-                self._config = yaml.safe_load(f)
+            self._config = load_yaml(str(self.config_path))
         return self._config
     
-    def create(self, name: str):
-        """Create a transformer instance by name."""
+    def names(self) -> Tuple[str, ...]:
+        """Configured transformer names, in config order."""
+        if self._names is None:
+            self._names = tuple(self.load_config()['transformers'])
+        return self._names
+    
+    def create(self, name: str) -> BaseTransformer:
+        """Create a transformer instance by name, reusing one already built."""
+        transformer = self._instances.get(name)
+        if transformer is None:
+            transformer = self._instances[name] = self._build(name)
+        return transformer
+    
+    def _build(self, name: str) -> BaseTransformer:
+        """Construct a transformer from its configuration."""
         config = self.load_config()
         
         if name not in config['transformers']:
@@ -42,13 +58,7 @@ class TransformerFactory:
     
     def create_all(self) -> Dict[str, Any]:
         """Create all configured transformers."""
-        config = self.load_config()
-        transformers = {}
-        
-        for name in config['transformers']:
-            transformers[name] = self.create(name)
-        
-        return transformers
+        return {name: self.create(name) for name in self.names()}
 
 
 # Register transformer types
@@ -1,8 +1,11 @@
 # pipeline/transformers/runner.py
-import json
-from pathlib import Path
-from typing import Iterator, Tuple, Dict, Any
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple, Dict, Any, Optional
+from .base import DATA_DIR
 from .factory import TransformerFactory
+from ..extractors.writer import JSONArrayWriter
 
 
 class TransformerRunner:
@@ -11,8 +14,9 @@ class TransformerRunner:
     """
 
     def __init__(self, config_path: str = None):
+        self.config_path = config_path
         self.factory = TransformerFactory(config_path)
-        self.data_dir = Path(__file__).parent.parent.parent / 'data'
+        self.data_dir = DATA_DIR
 
     def run_transformer(self, transformer_name: str, output_file: str = None) -> str:
         """
@@ -26,39 +30,50 @@ class TransformerRunner:
             Path to the output file
         """
         transformer = self.factory.create(transformer_name)
+        output_format = transformer.config.get('output_format', 'json')
         
         if output_file is None:
-            output_file = f"transformed/{transformer_name}.json"
+            output_file = f"transformed/{transformer_name}.{output_format}"
         
-        # Collect all chunks as tuples
-        chunks = list(transformer.transform())  # Directly collect tuples
+        if output_format == 'parquet':
+            _write_parquet(transformer.transform_batches(), str(self.data_dir / output_file))
+        elif output_format == 'msgpack':
+            _write_msgpack(transformer.transform_batches(), str(self.data_dir / output_file))
+        elif output_format == 'json':
+            # Stream chunk batches into a JSON array as they are produced (tuples become lists)
+            with JSONArrayWriter(output_file) as writer:
+                for batch in transformer.transform_batches():
+                    writer.write_many(batch)
+        else:
+            raise ValueError(f"Unknown output format: {output_format}")
         
-        # Write to file as JSON (tuples become lists during serialization)
-        output_path = self.data_dir / output_file
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_path, 'w') as f:
-            json.dump(chunks, f, indent=2)
-        
-        return str(output_path)
+        return str(self.data_dir / output_file)
 
-    def run_all_transformers(self) -> Dict[str, str]:
+    def run_all_transformers(self, max_workers: Optional[int] = None) -> Dict[str, str]:
         """
         Run all configured transformers and write chunks to files.
         
+        Transformers read and write independent files, so each runs in its
+        own process; this also keeps each one's txtai models in a separate
+        address space.
+        
+        Args:
+            max_workers: Maximum concurrent transformers (defaults to the CPU count)
+            
         Returns:
             Dictionary mapping transformer names to output file paths
         """
-        config = self.factory.load_config()
-        output_files = {}
+        names = self.factory.names()
+        workers = min(len(names), max_workers or os.cpu_count() or 1)
         
-        for transformer_name in config['transformers']:
-            output_path = self.run_transformer(transformer_name)
-            output_files[transformer_name] = output_path
+        if workers <= 1:
+            return {name: self.run_transformer(name) for name in names}
         
-        return output_files
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {name: executor.submit(_run_transformer, self.config_path, name) for name in names}
+            return {name: future.result() for name, future in futures.items()}
 
-    def collect_chunks(self, transformer_name: str) -> Iterator[Tuple[str, str, list]]:
+    def collect_chunks(self, transformer_name: str) -> Iterator[Tuple[str, str, Tuple[str, ...]]]:
         """
         Collect chunks from a transformer without writing to file.
         
@@ -70,3 +85,58 @@ class TransformerRunner:
         """
         transformer = self.factory.create(transformer_name)
         yield from transformer.transform()
+
+
+def _run_transformer(config_path: Optional[str], transformer_name: str) -> str:
+    """Process-pool entry point; builds its own runner so nothing unpicklable crosses processes."""
+    return TransformerRunner(config_path).run_transformer(transformer_name)
+
+
+@contextmanager
+def _atomic_path(path: str) -> Iterator[str]:
+    """Yield a temp path that replaces path only if the block completes; a failed write leaves no partial output."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    try:
+        yield tmp_path
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+def _write_msgpack(batches: Iterator[List[Tuple[str, str, Tuple[str, ...]]]], path: str) -> None:
+    """Stream batches of (id, text, tags) chunks into a file of concatenated msgpack arrays."""
+    # msgpack is only needed when a transformer opts into msgpack output
+    import msgpack
+    
+    packer = msgpack.Packer(use_bin_type=True)
+    
+    with _atomic_path(path) as tmp_path, open(tmp_path, 'wb') as f:
+        for batch in batches:
+            # Tuples pack as arrays; one write per batch
+            f.write(b''.join(map(packer.pack, batch)))
+
+
+def _write_parquet(batches: Iterator[List[Tuple[str, str, Tuple[str, ...]]]], path: str, row_group_size: int = 10000) -> None:
+    """Stream batches of (id, text, tags) chunks into a zstd-compressed Parquet file, one row group at a time."""
+    # pyarrow is only needed when a transformer opts into Parquet output
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    schema = pa.schema([('id', pa.string()), ('text', pa.string()), ('tags', pa.list_(pa.string()))])
+    
+    # ParquetWriter writes a valid footer even when the producer fails, so stage the file
+    with _atomic_path(path) as tmp_path, pq.ParquetWriter(tmp_path, schema, compression='zstd') as writer:
+        ids, texts, tags = [], [], []
+        for batch in batches:
+            for chunk_id, text, chunk_tags in batch:
+                ids.append(str(chunk_id))
+                texts.append(text)
+                tags.append(chunk_tags)
+            if len(ids) >= row_group_size:
+                writer.write_batch(pa.record_batch([ids, texts, tags], schema=schema))
+                ids, texts, tags = [], [], []
+        if ids:
+            writer.write_batch(pa.record_batch([ids, texts, tags], schema=schema))
@@ -1,8 +1,6 @@
 # pipeline/transformers/tabular_transformer.py
-from typing import Iterator, Tuple, Any, Dict
-from pathlib import Path
-import json
-from .base import BaseTransformer
+from typing import Iterator, List, Tuple, Any, Dict
+from .base import BaseTransformer, DATA_DIR, mmap_json
 from txtai.pipeline.data.tabular import Tabular
 
 
@@ -15,6 +13,7 @@ class TabularTransformer(BaseTransformer):
         super().__init__(name, config)
         self.id_column = config.get('id_column', 'id')
         self.text_columns = config.get('text_columns', [])
+        self.batch_size = config.get('batch_size', 1024)
         
         # Initialize txtai Tabular pipeline
         self.tabular = Tabular(
@@ -23,29 +22,30 @@ class TabularTransformer(BaseTransformer):
             content=False
         )
 
-    def transform(self) -> Iterator[Tuple[str, str, list]]:
+    def transform_batches(self) -> Iterator[List[Tuple[str, str, Tuple[str, ...]]]]:
         """
-        Transform tabular data into (id, text, tags) tuples.
+        Transform tabular data into batches of (id, text, tags) tuples.
         
         Returns:
-            Iterator of (id, text, tags) tuples
+            Iterator of lists of (id, text, tags) tuples
         """
         # Read extractor output
-        data_dir = Path(__file__).parent.parent.parent / 'data'
-        file_path = data_dir / 'extractors' / f'{self.config.get("source", "postgres")}.json'
+        file_path = DATA_DIR / 'extractors' / f'{self.config.get("source", "postgres")}.json'
         
         if not file_path.exists():
             return
         
-        with open(file_path, 'r') as f:
-            records = json.load(f)
+        records = mmap_json(file_path)
         
         # Use txtai Tabular pipeline to process data and yield results directly
         results = self.tabular(records)
         
         # Tabular already returns (id, text, None) tuples, just add tags
-        for result in results:
-            if isinstance(result, tuple) and len(result) == 3:
-                record_id, text, _ = result
-                tags = [f"source:{self.config.get('source', 'postgres')}"]
-                yield (record_id, text, tags)
+        tags = (f"source:{self.config.get('source', 'postgres')}",)
+        chunks = [
+            (result[0], result[1], tags)
+            for result in results
+            if isinstance(result, tuple) and len(result) == 3
+        ]
+        for start in range(0, len(chunks), self.batch_size):
+            yield chunks[start:start + self.batch_size]